@@ -1,12 +1,13 @@
 import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
+from utils import assets
 
 
 def set_page_config():
     """Set the initial page configuration."""
     st.set_page_config(
-        page_icon="https://github.com/Vinzzztty/Forecasting-Hidroponik/blob/V2/assets/logo_hijau.png?raw=true",
+        page_icon=assets.asset_path("logo_hijau.png", 320),
         page_title="Hydrosim - Home",
         layout="wide",
         initial_sidebar_state="expanded",
@@ -15,21 +16,24 @@ def set_page_config():
 
 def inject_custom_css():
     """Inject custom CSS for styling."""
+    banner_src = assets.asset_url("new_banner_800.png", 1600)
+    banner_srcset = assets.asset_srcset("new_banner_800.png")
     st.markdown(
-        """
+        f"""
         <style>
         /* Styling the header image */
-        .header-image {
+        .header-image {{
             width: 100%;
             height: auto;
-        }
+        }}
         
         /* Change the background color of the sidebar */
-        [data-testid="stSidebar"] {
+        [data-testid="stSidebar"] {{
             background-color: #ffffff;
-        }
+        }}
         </style>
-        <img src='https://github.com/Vinzzztty/Forecasting-Hidroponik/blob/V2/assets/new_banner_800.png?raw=true' class='header-image'/>
+        <img src='{banner_src}' srcset='{banner_srcset}' sizes='100vw'
+            alt='HydroSim' class='header-image'/>
         """,
         unsafe_allow_html=True,
     )
@@ -38,9 +42,7 @@ def inject_custom_css():
 def render_sidebar():
     """Render the sidebar with navigation."""
     with st.sidebar:
-        st.markdown(
-            "![Logo](https://github.com/Vinzzztty/Forecasting-Hidroponik/blob/V2/assets/new_hijau.png?raw=true)"
-        )
+        st.markdown(f"![Logo]({assets.asset_url('new_hijau.png', 320)})")
 
 
 def main():
@@ -87,7 +89,7 @@ def main():
     # Content for the second column
     # with col2:
     st.image(
-        "https://github.com/Vinzzztty/Forecasting-Hidroponik/blob/V2/assets/evaluasi_model.png?raw=true",
+        assets.asset_path("evaluasi_model.png", 1600),
         caption="Evaluasi Model",
     )
 
@@ -112,7 +114,7 @@ def main():
 
     with col2:
         st.image(
-            "https://github.com/Vinzzztty/Forecasting-Hidroponik/blob/V2/assets/perbandingan_model.png?raw=true",
+            assets.asset_path("perbandingan_model.png", 800),
             caption="Evaluasi Model",
         )
 
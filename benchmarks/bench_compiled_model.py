@@ -0,0 +1,85 @@
+"""Benchmark the compiled quality model against sklearn's predict.
+
+Two kinds of input per size:
+  log    - rows resampled from the training log (readings repeat, as in a
+           season of sensor data)
+  jitter - the same rows with noise at sensor resolution, nearly all distinct
+
+Every run checks that the compiled predictions equal sklearn's.
+
+    python -m benchmarks.bench_compiled_model [rows ...]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.compiled_model import compile_model
+from utils.model import (
+    QUALITY_FEATURE_COLUMNS,
+    QUALITY_MANIFEST_PATH,
+    load_quality_model,
+)
+from utils.preprocessing import read_sensor_csv
+
+DEFAULT_ROWS = [1, 1_000, 100_000]
+# Sensor resolution and jitter (in resolution steps) per feature
+RESOLUTION = np.array([0.1, 1, 1, 0.01, 1, 1, 0.1])
+JITTER_STEPS = np.array([3, 2, 50, 2, 10, 5, 2])
+REPEAT = 3
+
+
+def best_of(fn):
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def inputs(log, n_rows, rng):
+    rows = log[rng.integers(0, len(log), n_rows)]
+    noise = rng.normal(0, 1, rows.shape) * RESOLUTION * JITTER_STEPS
+    jitter = np.round((rows + noise) / RESOLUTION) * RESOLUTION
+    return {
+        "log": pd.DataFrame(rows, columns=QUALITY_FEATURE_COLUMNS),
+        "jitter": pd.DataFrame(jitter, columns=QUALITY_FEATURE_COLUMNS),
+    }
+
+
+def main(rows=None):
+    model, manifest = load_quality_model()
+    compiled = compile_model(model)
+
+    model_dir = os.path.dirname(QUALITY_MANIFEST_PATH)
+    joblib_size = os.path.getsize(os.path.join(model_dir, manifest["artifact"]))
+    print(f"joblib artifact   {joblib_size / 1e6:.2f} MB")
+    if "compiled_artifact" in manifest:
+        npz_size = os.path.getsize(
+            os.path.join(model_dir, manifest["compiled_artifact"])
+        )
+        print(f"compiled artifact {npz_size / 1e6:.2f} MB")
+
+    log = read_sensor_csv("./dataset/dataset_train_final.csv")
+    log = log[QUALITY_FEATURE_COLUMNS].to_numpy(dtype=float)
+    rng = np.random.default_rng(0)
+
+    for n_rows in rows or DEFAULT_ROWS:
+        for kind, X in inputs(log, n_rows, rng).items():
+            sk_seconds, expected = best_of(lambda: model.predict(X))
+            np_seconds, predicted = best_of(lambda: compiled.predict(X))
+            if not np.array_equal(expected, predicted):
+                raise AssertionError(f"{kind}/{n_rows}: predictions differ")
+            print(
+                f"{n_rows:>8} rows | {kind:<6} | sklearn {sk_seconds * 1000:>9.1f} ms"
+                f" | compiled {np_seconds * 1000:>9.1f} ms"
+                f" | x{sk_seconds / np_seconds:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]])
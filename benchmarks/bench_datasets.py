@@ -0,0 +1,54 @@
+"""Benchmark dataset load time and memory: CSV parsing vs the columnar copy.
+
+Every measurement runs in a fresh interpreter so the peak RSS is not polluted
+by earlier loads. Run `python -m utils.convert_datasets` first to build the copies.
+
+    python -m benchmarks.bench_datasets [csv ...]
+"""
+
+import glob
+import json
+import subprocess
+import sys
+
+LOADERS = {
+    "csv": "from utils.datasets import read_csv_typed as load",
+    "columnar": "from utils.datasets import load_dataset as load",
+}
+
+SNIPPET = """
+import json, resource, time
+{import_line}
+# Warm up library code paths so only the dataset itself is measured
+load("./dataset/dummy_notFormat_data_test.csv")
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+df = load({path!r})
+seconds = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"seconds": seconds, "rss_kib": peak - baseline, "rows": len(df)}}))
+"""
+
+
+def measure(loader, path):
+    code = SNIPPET.format(import_line=LOADERS[loader], path=path)
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(paths=None):
+    for path in paths or sorted(glob.glob("./dataset/*.csv")):
+        results = {loader: measure(loader, path) for loader in LOADERS}
+        csv, columnar = results["csv"], results["columnar"]
+        print(
+            f"{path}: {csv['rows']} rows | "
+            f"csv {csv['seconds'] * 1000:.1f} ms / {csv['rss_kib'] / 1024:.1f} MiB | "
+            f"columnar {columnar['seconds'] * 1000:.1f} ms / "
+            f"{columnar['rss_kib'] / 1024:.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
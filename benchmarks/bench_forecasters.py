@@ -0,0 +1,63 @@
+"""Compare the forecasting backends on accuracy and latency.
+
+Every bundled sensor log is backtested with evaluate_forecasters: each backend
+is fitted on the readings before the last --holdout days (Prophet is refitted
+with the pickled model's settings), forecasts those days and is scored against
+the daily mean LeafCount. Latency covers fit plus predict. Backends whose
+optional dependency is missing are reported with their error.
+
+    python -m benchmarks.bench_forecasters [--holdout 3] [--backend logistic ...]
+"""
+
+import argparse
+import glob
+import os
+import warnings
+
+import pandas as pd
+
+from utils.model import FORECASTERS, evaluate_forecasters, prepare_data
+from utils.preprocessing import preprocess_data
+
+DATASET_GLOB = "./dataset/*.csv"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Bandingkan akurasi dan latensi backend forecasting."
+    )
+    parser.add_argument("--holdout", type=int, default=3, help="hari uji")
+    parser.add_argument(
+        "--backend",
+        action="append",
+        choices=list(FORECASTERS),
+        help="hanya backend ini (boleh berulang)",
+    )
+    args = parser.parse_args(argv)
+
+    # Prophet's overflow and statsmodels' convergence warnings are harmless here
+    warnings.filterwarnings("ignore")
+
+    results = []
+    for path in sorted(glob.glob(DATASET_GLOB)):
+        raw = pd.read_csv(path)
+        if "LeafCount" not in raw.columns:
+            continue
+        df_prophet = prepare_data(preprocess_data(raw))
+        try:
+            metrics = evaluate_forecasters(
+                df_prophet, backends=args.backend, holdout_days=args.holdout
+            )
+        except ValueError as e:
+            print(f"{os.path.basename(path)}: {e}")
+            continue
+        metrics.insert(0, "dataset", os.path.basename(path))
+        results.append(metrics)
+
+    if results:
+        with pd.option_context("display.width", 160, "display.precision", 3):
+            print(pd.concat(results).reset_index().to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
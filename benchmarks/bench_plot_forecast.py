@@ -0,0 +1,93 @@
+"""Benchmark serialized size and build time of the animated forecast figure.
+
+Compares the previous per-day frame animation ("legacy": every frame holds all
+points up to that day, so the payload is quadratic) with the current modes.
+Build time covers figure construction plus JSON serialization, which is what
+Streamlit pays before anything reaches the browser.
+
+    python -m benchmarks.bench_plot_forecast [points ...]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objs as go
+
+from utils.visualization import plot_forecast
+
+DEFAULT_POINTS = [40, 400, 4000]
+
+
+def synthetic_forecast(n_points):
+    yhat = 18 / (1 + np.exp(-(np.arange(n_points) - n_points / 3) / (n_points / 10)))
+    return pd.DataFrame(
+        {
+            "ds": pd.date_range("2024-08-10", periods=n_points, freq="D"),
+            "yhat": yhat,
+            "yhat_lower": yhat - 1,
+            "yhat_upper": yhat + 1,
+        }
+    )
+
+
+def legacy_plot_forecast(forecast, periods):
+    # Frame structure of the previous implementation (static traces omitted)
+    forecast["day"] = (forecast["ds"] - forecast["ds"].min()).dt.days + 1
+    fig = plot_forecast(forecast, periods, animation=None)
+    fig.update(
+        frames=[
+            go.Frame(
+                data=[
+                    go.Scatter(
+                        x=forecast["day"][:i],
+                        y=forecast["yhat"][:i],
+                        mode="lines+markers",
+                        name="Forecast",
+                        line=dict(color="red", dash="dash"),
+                    )
+                ],
+                name=str(i),
+            )
+            for i in range(1, len(forecast) + 1)
+        ]
+    )
+    fig.update_layout(
+        sliders=[
+            {
+                "steps": [
+                    {"label": str(i), "method": "animate", "args": [[str(i)]]}
+                    for i in range(1, len(forecast) + 1)
+                ]
+            }
+        ]
+    )
+    return fig
+
+
+def measure(build, n_points):
+    forecast = synthetic_forecast(n_points)
+    start = time.perf_counter()
+    payload = build(forecast, n_points).to_json()
+    return len(payload), time.perf_counter() - start
+
+
+def main(points=None):
+    variants = {
+        "legacy": legacy_plot_forecast,
+        "frames": lambda f, p: plot_forecast(f, p, animation="frames"),
+        "reveal": lambda f, p: plot_forecast(f, p, animation="reveal"),
+        "static": lambda f, p: plot_forecast(f, p, animation=None),
+    }
+    for n_points in points or DEFAULT_POINTS:
+        for name, build in variants.items():
+            size, seconds = measure(build, n_points)
+            print(
+                f"{n_points:>5} points | {name:<6} | {size / 1024:>10.1f} KiB | "
+                f"{seconds * 1000:>8.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,86 @@
+"""Benchmark prediction modes: latency versus interval accuracy.
+
+Interval error is the mean absolute difference of yhat_lower/yhat_upper from a
+high-sample reference run (REFERENCE_SAMPLES draws); yhat error is measured
+against the full predict.
+
+    python -m benchmarks.bench_predict_modes [rows ...]
+"""
+
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from utils.model import (
+    LEAF_CAP,
+    PROPHET_MODEL_PATH,
+    create_future_dataframe,
+    load_model,
+    make_predictions,
+    prepare_data,
+)
+from utils.preprocessing import preprocess_data
+
+DEFAULT_ROWS = [40, 400, 4000]
+SAMPLE_COUNTS = [1000, 500, 200, 100, 50]
+REFERENCE_SAMPLES = 5000
+REPEAT = 3
+
+
+def best_of(fn):
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main(rows=None):
+    # Prophet's logistic trend sampling overflows harmlessly on long horizons
+    warnings.filterwarnings("ignore", category=RuntimeWarning)
+    model = load_model(PROPHET_MODEL_PATH)
+    df = preprocess_data(pd.read_csv("./dataset/dummy_data_test.csv"))
+    df_prophet = prepare_data(df)
+
+    for n_rows in rows or DEFAULT_ROWS:
+        future = create_future_dataframe(df_prophet, periods=n_rows)
+        future["cap"] = LEAF_CAP
+
+        np.random.seed(0)
+        reference = make_predictions(
+            model, future, uncertainty_samples=REFERENCE_SAMPLES
+        )
+
+        variants = [
+            (f"full/{samples}", dict(uncertainty_samples=samples))
+            for samples in SAMPLE_COUNTS
+        ]
+        variants.append(("point", dict(mode="point")))
+
+        for name, kwargs in variants:
+            seconds, forecast = best_of(
+                lambda: make_predictions(model, future, **kwargs)
+            )
+            yhat_error = np.abs(forecast["yhat"] - reference["yhat"]).max()
+            if "yhat_lower" in forecast:
+                interval_error = np.mean(
+                    [
+                        np.abs(forecast[column] - reference[column]).mean()
+                        for column in ["yhat_lower", "yhat_upper"]
+                    ]
+                )
+                interval = f"{interval_error:.4f}"
+            else:
+                interval = "-"
+            print(
+                f"{n_rows:>5} rows | {name:<9} | {seconds * 1000:>9.1f} ms | "
+                f"yhat err {yhat_error:.2e} | interval err {interval}"
+            )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,83 @@
+"""Benchmark the vectorized day/time -> datetime reconstruction.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_preprocess [csv ...]
+"""
+
+import sys
+import time
+
+import pandas as pd
+
+from utils.preprocessing import START_DATE, add_datetime_from_day_time
+
+DEFAULT_FILES = [
+    "./dataset/dummy_notFormat_data_test.csv",
+    "./dataset/DataFieldFULLSIOHITest01072024.csv",
+    "./dataset/DataFieldFULLSIOHITrainFULLPattern01072024.csv",
+]
+IMPORTANT_COLUMNS = [
+    "datetime",
+    "LeafCount",
+    "hole",
+    "temperature",
+    "humidity",
+    "light",
+    "pH",
+    "EC",
+    "TDS",
+    "WaterTemp",
+]
+
+
+def legacy_add_datetime(df, start_date=START_DATE):
+    # Row-wise path previously used by pages/2-Forecasting.py
+    df["day"] = df["day"].astype(int)
+    df["time"] = df["time"].apply(lambda x: "{:.2f}".format(x))
+    df["time"] = pd.to_datetime(df["time"], format="%H.%M").dt.time
+    df["time"] = df["time"].astype(str)
+    df["datetime"] = df.apply(
+        lambda row: start_date
+        + pd.Timedelta(days=row["day"] - 1)
+        + pd.to_timedelta(row["time"]),
+        axis=1,
+    )
+    df = df.drop_duplicates(subset=["day", "time", "LeafCount"])
+    df.set_index("datetime", inplace=True)
+    df = df.sort_index()
+    df["datetime"] = df.apply(
+        lambda row: start_date
+        + pd.Timedelta(days=row["day"] - 1)
+        + pd.to_timedelta(row["time"]),
+        axis=1,
+    )
+    return df
+
+
+def best_of(fn, df, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(df.copy())
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main(paths=None, repeat=3):
+    for path in paths or DEFAULT_FILES:
+        raw = pd.read_csv(path)
+        legacy_s, legacy = best_of(legacy_add_datetime, raw, repeat)
+        fast_s, fast = best_of(add_datetime_from_day_time, raw, repeat)
+
+        pd.testing.assert_frame_equal(
+            legacy[IMPORTANT_COLUMNS], fast[IMPORTANT_COLUMNS]
+        )
+        print(
+            f"{path}: {len(raw)} rows | legacy {legacy_s * 1000:.1f} ms | "
+            f"vectorized {fast_s * 1000:.1f} ms | {legacy_s / fast_s:.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
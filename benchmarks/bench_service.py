@@ -0,0 +1,94 @@
+"""Benchmark /classify of the HTTP service with and without micro-batching.
+
+A uvicorn server runs in a background thread; `clients` threads each send
+single-reading JSON requests (readings sampled from the sensor log) for a
+fixed number of requests. "unbatched" scores every request on its own
+(max_rows=1), "batched" uses the service defaults.
+
+    python -m benchmarks.bench_service [clients ...]
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import uvicorn
+
+from utils.model import QUALITY_FEATURE_COLUMNS
+from utils.preprocessing import read_sensor_csv
+from utils.service import ClassifierBatcher, create_app
+
+DEFAULT_CLIENTS = [1, 8, 32]
+REQUESTS_PER_CLIENT = 50
+PORT = 8799
+
+
+def serve(app):
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=PORT, log_level="error")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+def client(readings, offset):
+    session = requests.Session()
+    latencies = []
+    for i in range(REQUESTS_PER_CLIENT):
+        reading = readings[(offset + i) % len(readings)]
+        start = time.perf_counter()
+        response = session.post(f"http://127.0.0.1:{PORT}/classify", json=reading)
+        latencies.append(time.perf_counter() - start)
+        response.raise_for_status()
+    return latencies
+
+
+def run(app, readings, clients):
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        start = time.perf_counter()
+        results = list(
+            executor.map(lambda c: client(readings, c * 997), range(clients))
+        )
+        elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for result in results for latency in result)
+    stats = app.state.batcher.stats()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+        "requests_per_batch": stats["requests"] / max(stats["batches"], 1),
+    }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    clients_list = [int(arg) for arg in argv] or DEFAULT_CLIENTS
+    log = read_sensor_csv("./dataset/dummy_data_test.csv")
+    readings = log[QUALITY_FEATURE_COLUMNS].to_dict("records")
+
+    for variant in ("unbatched", "batched"):
+        for clients in clients_list:
+            app = create_app()
+            if variant == "unbatched":
+                app.state.batcher = ClassifierBatcher(app.state.pool, max_rows=1)
+            server, thread = serve(app)
+            try:
+                result = run(app, readings, clients)
+            finally:
+                server.should_exit = True
+                thread.join()
+            print(
+                f"{variant:<9} {clients:>3} clients | {result['rps']:>8.1f} req/s | "
+                f"p50 {result['p50_ms']:>7.1f} ms | p95 {result['p95_ms']:>7.1f} ms | "
+                f"{result['requests_per_batch']:>5.1f} req/batch"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""Benchmark the Forecasting page pipeline stage by stage, with JSON output.
+
+Every bundled sensor log in dataset/ is measured, plus synthetic copies of
+SYNTHETIC_BASE scaled to 10x/100x/1000x rows and holes (each copy of the log
+becomes a new set of holes). For every stage the best wall time of --repeat
+runs is recorded, then the peak traced allocation of one extra run under
+tracemalloc (timed runs are not traced, tracing slows allocation-heavy code).
+
+    python -m benchmarks.run_all [--scales 1 10 100 1000] [--output results.json]
+    python -m benchmarks.run_all --compare baseline.json results.json
+
+--compare prints the time/memory ratio per (dataset, stage) and exits with
+status 1 when any stage got slower than --threshold and by more than
+--min-delta-ms. Only compare runs made on the same, otherwise idle machine;
+on shared hosts run-to-run noise alone can exceed x1.2.
+"""
+
+import argparse
+import gc
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+from streamlit import config as streamlit_config
+from streamlit import logger as streamlit_logger
+
+from utils.cek_optimization import check_optimization, evaluate_ranges
+from utils.model import (
+    INTERACTIVE_UNCERTAINTY_SAMPLES,
+    LEAF_CAP,
+    MAX_DAY,
+    PROPHET_MODEL_PATH,
+    LogisticForecaster,
+    create_future_dataframe,
+    load_model,
+    make_predictions,
+    prepare_data,
+)
+from utils.preprocessing import preprocess_data
+from utils.visualization import (
+    build_daily_aggregates,
+    calculate_growth_percentage,
+    plot_forecast,
+    plot_growth_bar,
+    visaulize_all_features,
+    visualize_comparison,
+    visualize_feature,
+)
+
+DATASET_GLOB = "./dataset/*.csv"
+SYNTHETIC_BASE = "./dataset/dummy_data_test.csv"
+DEFAULT_SCALES = [10, 100, 1000]
+DEFAULT_OUTPUT = "./benchmarks/results/latest.json"
+DEFAULT_THRESHOLD = 1.2
+# Differences below this are timer noise, whatever the ratio
+DEFAULT_MIN_DELTA_MS = 5.0
+
+
+def scale_log(raw, factor):
+    # factor copies of the log, each with its own block of hole ids
+    holes = raw["hole"].max() + 1
+    copies = [raw.assign(hole=raw["hole"] + i * holes) for i in range(factor)]
+    return pd.concat(copies, ignore_index=True)
+
+
+def input_logs(scales):
+    logs = {}
+    for path in sorted(glob.glob(DATASET_GLOB)):
+        raw = pd.read_csv(path)
+        if "LeafCount" in raw.columns:
+            logs[os.path.basename(path)] = raw
+
+    base = pd.read_csv(SYNTHETIC_BASE)
+    for factor in scales:
+        name = f"{os.path.basename(SYNTHETIC_BASE)}@{factor}x"
+        logs[name] = scale_log(base, factor)
+
+    return logs
+
+
+def pipeline_stages(raw, model):
+    """(name, callable) for each stage, in page order, run on the outputs of
+    the previous stages so every callable can be repeated on its own."""
+    df = preprocess_data(raw)
+    df_prophet = prepare_data(df)
+    future = create_future_dataframe(df_prophet, MAX_DAY)
+    future["cap"] = LEAF_CAP
+    forecast = make_predictions(
+        model, future, uncertainty_samples=INTERACTIVE_UNCERTAINTY_SAMPLES
+    )
+    daily = build_daily_aggregates(df)
+    growth = calculate_growth_percentage(df, forecast)
+
+    return [
+        ("preprocess_data", lambda: preprocess_data(raw)),
+        ("prepare_data", lambda: prepare_data(df)),
+        (
+            "create_future_dataframe",
+            lambda: create_future_dataframe(df_prophet, MAX_DAY),
+        ),
+        (
+            "make_predictions",
+            lambda: make_predictions(
+                model, future, uncertainty_samples=INTERACTIVE_UNCERTAINTY_SAMPLES
+            ),
+        ),
+        (
+            "make_predictions[point]",
+            lambda: make_predictions(model, future, mode="point"),
+        ),
+        (
+            "forecast[logistic]",
+            lambda: LogisticForecaster().predict(df_prophet, future),
+        ),
+        ("evaluate_ranges", lambda: evaluate_ranges(df)),
+        ("check_optimization", lambda: check_optimization(df)),
+        ("plot_forecast", lambda: plot_forecast(forecast.copy(), MAX_DAY)),
+        (
+            "calculate_growth_percentage",
+            lambda: calculate_growth_percentage(df, forecast),
+        ),
+        ("plot_growth_bar", lambda: plot_growth_bar(*growth)),
+        ("build_daily_aggregates", lambda: build_daily_aggregates(df)),
+        ("visaulize_all_features", lambda: visaulize_all_features(df, daily=daily)),
+        ("visualize_feature", lambda: visualize_feature(df, "pH", daily=daily)),
+        (
+            "visualize_comparison",
+            lambda: visualize_comparison(df, "EC", "TDS", daily=daily),
+        ),
+    ]
+
+
+def measure(fn, repeat):
+    # Like timeit: no garbage collection pauses inside the timed runs
+    timings = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return min(timings), peak
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run(scales, repeat, stages=None):
+    model = load_model(PROPHET_MODEL_PATH)
+    logs = input_logs(scales)
+    results = []
+
+    # One untimed pass so import-time and first-call costs (plotly templates,
+    # Stan model setup) do not land on whichever dataset comes first
+    smallest = min(logs.values(), key=len)
+    for _, fn in pipeline_stages(smallest, model):
+        fn()
+
+    for name, raw in logs.items():
+        for stage, fn in pipeline_stages(raw, model):
+            if stages and stage not in stages:
+                continue
+            seconds, peak = measure(fn, repeat)
+            results.append(
+                {
+                    "dataset": name,
+                    "rows": len(raw),
+                    "holes": int(raw["hole"].nunique()),
+                    "stage": stage,
+                    "seconds": seconds,
+                    "peak_bytes": peak,
+                }
+            )
+            print(
+                f"{name:<45} {len(raw):>9} rows | {stage:<27} | "
+                f"{seconds * 1000:>10.1f} ms | {peak / 2**20:>9.1f} MiB"
+            )
+
+    return {"environment": environment(), "repeat": repeat, "results": results}
+
+
+def compare(baseline_path, current_path, threshold, min_delta_ms=DEFAULT_MIN_DELTA_MS):
+    with open(baseline_path) as f:
+        baseline = {(r["dataset"], r["stage"]): r for r in json.load(f)["results"]}
+    with open(current_path) as f:
+        current = json.load(f)["results"]
+
+    regressions = 0
+    for result in current:
+        before = baseline.get((result["dataset"], result["stage"]))
+        if before is None:
+            continue
+        time_ratio = result["seconds"] / max(before["seconds"], 1e-9)
+        memory_ratio = result["peak_bytes"] / max(before["peak_bytes"], 1)
+        flag = ""
+        delta_ms = (result["seconds"] - before["seconds"]) * 1000
+        if time_ratio > threshold and delta_ms > min_delta_ms:
+            flag = "  <-- slower"
+            regressions += 1
+        print(
+            f"{result['dataset']:<45} | {result['stage']:<27} | "
+            f"time x{time_ratio:>6.2f} | memory x{memory_ratio:>6.2f}{flag}"
+        )
+
+    print(
+        f"{regressions} stage(s) slower than x{threshold} "
+        f"(and by more than {min_delta_ms} ms)"
+    )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark waktu dan memori pipeline halaman Forecasting."
+    )
+    parser.add_argument("--scales", type=int, nargs="*", default=DEFAULT_SCALES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--stage", action="append", help="hanya stage ini (boleh berulang)"
+    )
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BASELINE", "CURRENT"),
+        help="bandingkan dua file hasil tanpa menjalankan benchmark",
+    )
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS)
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, args.threshold, args.min_delta_ms) else 0)
+
+    # Figures are built outside a Streamlit session; its bare-mode warnings
+    # and Prophet's harmless overflow warnings would drown the table
+    streamlit_config.set_option("logger.level", "error")
+    streamlit_logger.set_log_level("error")
+    warnings.filterwarnings("ignore", category=RuntimeWarning)
+
+    report = run(args.scales, args.repeat, args.stage)
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Hasil disimpan ke {args.output}")
+
+
+if __name__ == "__main__":
+    main()
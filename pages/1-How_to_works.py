@@ -1,11 +1,12 @@
 import streamlit as st
 import pandas as pd
+from utils import assets
 
 
 def set_page_config():
     """Set the initial page configuration."""
     st.set_page_config(
-        page_icon="https://github.com/Vinzzztty/Forecasting-Hidroponik/blob/V2/assets/logo_hijau.png?raw=true",
+        page_icon=assets.asset_path("logo_hijau.png", 320),
         page_title="Hydrosim - Forecasting",
         layout="wide",
         initial_sidebar_state="expanded",
@@ -36,9 +37,7 @@ def inject_custom_css():
 def render_sidebar():
     """Render the sidebar with navigation."""
     with st.sidebar:
-        st.markdown(
-            "![Logo](https://github.com/Vinzzztty/Forecasting-Hidroponik/blob/V2/assets/new_hijau.png?raw=true)"
-        )
+        st.markdown(f"![Logo]({assets.asset_url('new_hijau.png', 320)})")
 
 
 def download_template_csv():
@@ -117,7 +116,7 @@ def main():
     )
 
     st.image(
-        "https://github.com/Vinzzztty/Forecasting-Hidroponik/blob/V2/assets/pre-processing-data.png?raw=true",
+        assets.asset_path("pre-processing-data.png", 1600),
         caption="Contoh Format CSV 🗂️",
         use_column_width=True,
     )
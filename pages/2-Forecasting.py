@@ -1,18 +1,38 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
-from utils import model, visualization, cek_optimization
+from utils import (
+    assets,
+    datasets,
+    model,
+    visualization,
+    cek_optimization,
+    preprocessing,
+    instrumentation,
+    hole_forecast,
+    scenario,
+)
 import matplotlib.pyplot as plt
-import time
 import warnings
 
 # GLOBAL VARIABLE
 MAX_DAY = 40
+# Seconds between status checks of a running forecast job
+JOB_POLL_SECONDS = 1.0
+# Forecasting backends offered on the page, see utils.model.FORECASTERS
+BACKEND_LABELS = {
+    "prophet": "Prophet (laporan detail)",
+    "logistic": "Kurva logistik (cepat)",
+    "arima": "ARIMA",
+}
+# st.fragment is st.experimental_fragment before Streamlit 1.37
+fragment = getattr(st, "fragment", None) or st.experimental_fragment
 
 
 def set_page_config():
     """Set the initial page configuration."""
     st.set_page_config(
-        page_icon="https://github.com/Vinzzztty/Forecasting-Hidroponik/blob/V2/assets/logo_hijau.png?raw=true",
+        page_icon=assets.asset_path("logo_hijau.png", 320),
         page_title="Hydrosim - Forecasting",
         layout="wide",
         initial_sidebar_state="expanded",
@@ -43,9 +63,16 @@ def inject_custom_css():
 def render_sidebar():
     """Render the sidebar with navigation."""
     with st.sidebar:
-        st.markdown(
-            "![Logo](https://github.com/Vinzzztty/Forecasting-Hidroponik/blob/V2/assets/new_hijau.png?raw=true)"
-        )
+        st.markdown(f"![Logo]({assets.asset_url('new_hijau.png', 320)})")
+
+
+def read_csv(source):
+    """Stream a CSV into a preprocessed frame, reporting unreadable files in the UI."""
+    try:
+        return preprocessing.read_sensor_csv(source)
+    except ValueError as e:
+        st.error(f"⚠️ {e}")
+        return None
 
 
 def handle_file_upload(option):
@@ -55,111 +82,67 @@ def handle_file_upload(option):
             "Unggah file CSV untuk dilakukan prediksi", type=["csv"]
         )
         if uploaded_file is not None:
-            return pd.read_csv(uploaded_file)
+            return read_csv(uploaded_file)
     elif option == "Gunakan contoh file CSV":
-        url_example = "https://raw.githubusercontent.com/Vinzzztty/Forecasting-Hidroponik/main/dataset/dummy_data_test.csv"
-        st.write("Menggunakan contoh file CSV dari URL")
-        return pd.read_csv(url_example)
+        example_path = datasets.resolve_data_source("dummy_data_test.csv")
+        if example_path is None:
+            st.info("⏳ Contoh file CSV sedang diunduh, coba lagi sebentar.")
+            return None
+        st.write("Menggunakan contoh file CSV")
+        # Typed columnar copy built at deploy, CSV otherwise; main() preprocesses
+        return datasets.load_dataset(example_path)
     return None
 
 
 def preprocess_data(df):
     """Preprocess the input data to ensure required columns are available and properly formatted."""
-    # check if 'datetime' column is not present
-    if "datetime" not in df.columns:
-        st.info(
-            "Kolom 'datetime' tidak ditemukan, akan membuat kolom 'datetime' dari kolom 'day' dan 'time' secara otomatis!."
-        )
-
-        # Inisialisasi start_date
-        start_date = pd.to_datetime("2024-07-01")
-
-        # Ensure 'day' column exists and is of integer type
-        if "day" in df.columns:
-            df["day"] = df["day"].astype(int)
-        else:
-            st.error("Kolom 'day' tidak ditemukan pada file CSV.")
-
-        # Ensure 'time' column exists and format it properly
-        if "time" in df.columns:
-            df["time"] = df["time"].apply(lambda x: "{:.2f}".format(x))
-            df["time"] = pd.to_datetime(df["time"], format="%H.%M").dt.time
-
-            # Replace dots with colons for time formatting
-            df["time"] = df["time"].astype(str)
-
-            df["datetime"] = df.apply(
-                lambda row: start_date
-                + pd.Timedelta(days=row["day"] - 1)
-                + pd.to_timedelta(row["time"]),
-                axis=1,
-            )
-
-            df = df.drop_duplicates(subset=["day", "time", "LeafCount"])
-
-            df.set_index("datetime", inplace=True)
-            df = df.sort_index()
-
-        else:
-            st.error("Kolom 'time' tidak ditemukan pada file CSV.")
-            return None
-
-        df["datetime"] = df.apply(
-            lambda row: start_date
-            + pd.Timedelta(days=row["day"] - 1)
-            + pd.to_timedelta(row["time"]),
-            axis=1,
-        )
-
-    # Convert 'datetime'column to datetime format if it's not already
-    if not pd.api.types.is_datetime64_any_dtype(df["datetime"]):
-        df["datetime"] = pd.to_datetime(df["datetime"], errors="coerce")
-
-        if df["datetime"].isnull().any():
-            st.error("⚠️ Ada nilai yang tidak bisa dikonversi ke format datetime.")
-            return None
-
-    important_columns = [
-        "datetime",
-        "LeafCount",
-        "hole",
-        "temperature",
-        "humidity",
-        "light",
-        "pH",
-        "EC",
-        "TDS",
-        "WaterTemp",
-    ]
-    return df[important_columns]
+    try:
+        return preprocessing.preprocess_data(df)
+    except ValueError as e:
+        st.error(f"⚠️ {e}")
+        return None
 
 
 def forecast_growth(df):
     """Forecast the growth of leaves based on the model and user input."""
-    df_prophet = model.prepare_data(df)
-    models = model.load_model("./model/prophet_model.pkl")
+    timer = instrumentation.StageTimer("forecast_growth")
+
+    with st.spinner(text="⏳ Menyiapkan data..."):
+        with timer.stage("prepare"):
+            df_prophet = model.prepare_data(df)
 
     unique_days = df["datetime"].dt.date.nunique()
     st.info(f"🗓️ Total hari setelah di Tanam: {unique_days} hari")
 
-    with st.spinner(text="⏳ Sedang menganalisis..."):
-        time.sleep(2)
-
-    future = models.make_future_dataframe(periods=unique_days, freq="D")
-    for feature in [
-        "hole",
-        "temperature",
-        "humidity",
-        "light",
-        "pH",
-        "EC",
-        "TDS",
-        "WaterTemp",
-    ]:
-        future[feature] = df_prophet[feature].iloc[-1]
-    future["cap"] = 18
-
-    forecast = models.predict(future)
+    backend = st.selectbox(
+        "🧮 Metode forecasting",
+        model.available_forecasters(),
+        format_func=lambda name: BACKEND_LABELS.get(name, name),
+    )
+
+    # One predict up to MAX_DAY on the background queue; every slider position
+    # is a slice of it. Reruns and other sessions join the same job.
+    with timer.stage("submit"):
+        job = model.submit_forecast_job(
+            df_prophet,
+            max_day=MAX_DAY,
+            uncertainty_samples=model.INTERACTIVE_UNCERTAINTY_SAMPLES,
+            backend=backend,
+        )
+    if not job.done():
+        show_job_progress(job)
+        st.stop()
+
+    try:
+        full_forecast = job.result()
+    except Exception as e:
+        st.error(f"⚠️ Forecast gagal: {e}")
+        st.stop()
+    # The job's own stages count once, on the run that first sees it finished
+    job_timer = model.claim_job_timer(job)
+    if job_timer is not None:
+        timer.stages.update(job_timer.stages)
+
     max_periods = MAX_DAY - unique_days
     periods = st.slider(
         "⏳ Pilih hari untuk Forecasting pertumbuhan daun",
@@ -167,14 +150,17 @@ def forecast_growth(df):
         max_value=max_periods,
         step=1,
     )
-    future = model.create_future_dataframe(df_prophet, periods=periods)
-    future["cap"] = 18
-    forecast = model.make_predictions(models, future)
+    forecast = model.slice_forecast(full_forecast, periods)
 
     st.markdown(""" --- """)
     st.markdown(f"### 📈 Hasil Forecasting untuk {periods} Hari Ke Depan")
-    fig = visualization.plot_forecast(forecast, periods)
+    with st.spinner(text="⏳ Membuat grafik..."):
+        with timer.stage("plot"):
+            fig = visualization.plot_forecast(forecast, periods)
     st.plotly_chart(fig)
+    reused = " · forecast dipakai ulang" if job_timer is None else ""
+    st.caption(f"⏱️ {timer.summary()}{reused}")
+    timer.emit(rows=len(df), periods=periods, reused_forecast=job_timer is None)
 
     col1, col2 = st.columns([6, 4])
     with col1:
@@ -196,18 +182,106 @@ def forecast_growth(df):
     return df_prophet, forecast
 
 
+@fragment(run_every=JOB_POLL_SECONDS)
+def show_job_progress(job):
+    """Show the status of a running forecast job and rerun the page once it ends."""
+    if job.done():
+        st.rerun()
+    st.info(
+        f"⏳ Forecast sedang diproses di latar belakang "
+        f"({job.status}, {job.elapsed:.1f} s). Halaman diperbarui otomatis."
+    )
+
+
+def compare_forecasters(df_prophet):
+    """Backtest every available backend on the last days of the uploaded log."""
+    try:
+        metrics = model.evaluate_forecasters(
+            df_prophet,
+            backends=model.available_forecasters(),
+            uncertainty_samples=model.INTERACTIVE_UNCERTAINTY_SAMPLES,
+        )
+    except ValueError as e:
+        st.error(f"⚠️ {e}")
+        return
+    metrics.index = metrics.index.map(lambda name: BACKEND_LABELS.get(name, name))
+    st.dataframe(metrics)
+    st.caption(
+        "Setiap metode dilatih ulang pada data sebelum hari-hari terakhir lalu "
+        "memprediksi hari-hari tersebut. MAE/RMSE dalam jumlah daun, MAPE dalam "
+        "persen, latensi (latih + prediksi) dalam milidetik."
+    )
+
+
+def forecast_per_hole(df_prophet):
+    """Forecast every hole separately and show the per-hole and aggregate view."""
+    with st.spinner(text="⏳ Melatih model untuk setiap lubang..."):
+        try:
+            per_hole = hole_forecast.forecast_per_hole(df_prophet, periods=MAX_DAY)
+        except ValueError as e:
+            st.error(f"⚠️ {e}")
+            return
+    aggregate = hole_forecast.aggregate_hole_forecasts(per_hole)
+
+    st.plotly_chart(visualization.plot_hole_forecasts(per_hole, aggregate))
+    st.dataframe(aggregate)
+
+
+def scenario_range(feature, values):
+    """Slider for the sweep range of one regressor plus its number of levels."""
+    low, high = float(values.min()), float(values.max())
+    if low == high:
+        low, high = low * 0.5, high * 1.5 or 1.0
+    start, stop = st.slider(
+        f"Rentang {feature}", low, high, (low, high), key=f"range_{feature}"
+    )
+    steps = st.number_input(
+        f"Jumlah level {feature}", 2, 30, 10, key=f"steps_{feature}"
+    )
+    return np.linspace(start, stop, int(steps))
+
+
+def simulate_scenarios(df_prophet):
+    """Sweep two regressors over a grid and show the predicted leaf count per pair."""
+    features = list(scenario.REGRESSOR_COLUMNS[1:])
+    col1, col2 = st.columns(2)
+    with col1:
+        feature_x = st.selectbox(
+            "Variabel X", features, index=features.index("EC"), key="scenario_x"
+        )
+        levels_x = scenario_range(feature_x, df_prophet[feature_x])
+    with col2:
+        features_y = [feature for feature in features if feature != feature_x]
+        feature_y = st.selectbox("Variabel Y", features_y, key="scenario_y")
+        levels_y = scenario_range(feature_y, df_prophet[feature_y])
+
+    grid = scenario.scenario_grid(**{feature_x: levels_x, feature_y: levels_y})
+    with st.spinner(text=f"⏳ Mensimulasikan {len(grid)} skenario..."):
+        result = scenario.simulate_scenarios(df_prophet, grid, periods=MAX_DAY)
+
+    st.plotly_chart(visualization.plot_scenario_heatmap(result, feature_x, feature_y))
+
+    final = result[result["day"] == result["day"].max()]
+    best = final.loc[final["yhat"].idxmax()]
+    st.info(
+        f"🏆 Skenario terbaik: {feature_x} = {best[feature_x]:.2f}, "
+        f"{feature_y} = {best[feature_y]:.2f} dengan prediksi "
+        f"**{best['yhat']:.1f}** daun pada hari ke-{MAX_DAY}."
+    )
+
+
 def select_image_path(periods):
     """Select the appropriate image based on the predicted leaf count."""
     if periods <= 10:
-        return "https://github.com/Vinzzztty/Forecasting-Hidroponik/blob/V2/assets/early_leaf.png?raw=true"
+        return assets.asset_url("early_leaf.png", 500)
     elif periods <= 14:
-        return "https://github.com/Vinzzztty/Forecasting-Hidroponik/blob/V2/assets/over.png?raw=true"
+        return assets.asset_url("over.png", 500)
     elif periods <= 18:
-        return "https://github.com/Vinzzztty/Forecasting-Hidroponik/blob/V2/assets/mid_leaf.png?raw=true"
+        return assets.asset_url("mid_leaf.png", 500)
     elif periods <= 24:
-        return "https://github.com/Vinzzztty/Forecasting-Hidroponik/blob/V2/assets/normal.png?raw=true"
+        return assets.asset_url("normal.png", 500)
     else:
-        return "https://github.com/Vinzzztty/Forecasting-Hidroponik/blob/V2/assets/high_leaf.png?raw=true"
+        return assets.asset_url("high_leaf.png", 500)
 
 
 def display_summary(df, df_prophet, forecast, periods):
@@ -225,36 +299,37 @@ def display_summary(df, df_prophet, forecast, periods):
     st.plotly_chart(fig)
 
     st.markdown("##### 🔍 Kesimpulan Masing Masing Variabel")
-    suggestions = cek_optimization.check_optimization(
-        pd.merge(df_prophet, forecast, on="ds")
-    )
+    evaluation = cek_optimization.evaluate_ranges(df)
+    suggestions = cek_optimization.check_optimization(df, evaluation)
 
     if suggestions:
-        # Extract the variable names from suggestions
-        variable_names = [suggestion.split()[2] for suggestion in suggestions]
-
-        # Filter to include only '_x' columns and remove '_x' for display
-        important_columns = [name for name in variable_names if name.endswith("_x")]
-        display_names = [name.replace("_x", "") for name in important_columns]
-
-        # Display selectbox for variable selection with cleaned names
-        selected_display_name = st.selectbox(
+        display_names = list(evaluation["summary"].index)
+        selected_variable = st.selectbox(
             "Pilih variabel untuk melihat kesimpulan:", display_names
         )
-
-        # Add '_x' back to match the original variable names in `suggestions`
-        selected_variable = selected_display_name + "_x"
-
-        # Find and display the conclusion for the selected variable
-        selected_conclusion = next(
-            (
-                suggestion
-                for suggestion in suggestions
-                if selected_variable in suggestion
-            ),
-            "Kesimpulan tidak ditemukan.",
+        st.write(suggestions[display_names.index(selected_variable)])
+
+        st.markdown("##### 📉 Pelanggaran Rentang Optimal")
+        summary = evaluation["summary"]
+        table = pd.DataFrame(
+            {
+                "Rata-rata": summary["mean"],
+                "Rentang": summary["lower"].astype(str)
+                + " - "
+                + summary["upper"].astype(str),
+                "Di luar rentang (%)": (summary["violation_fraction"] * 100).round(1),
+                "Streak terpanjang (data)": summary["longest_streak"],
+            }
+        )
+        if "streak_start" in summary:
+            table["Mulai streak"] = summary["streak_start"]
+            table["Akhir streak"] = summary["streak_end"]
+        st.dataframe(table)
+        st.plotly_chart(
+            visualization.plot_violation_timeline(
+                cek_optimization.violation_timeline(evaluation["timeline"])
+            )
         )
-        st.write(selected_conclusion)
     else:
         st.subheader(
             "✅ Semua variabel berada dalam kondisi optimal untuk pertumbuhan tanaman selada."
@@ -280,17 +355,31 @@ def main():
             df_prophet, forecast = forecast_growth(df)
             display_summary(df, df_prophet, forecast, periods=MAX_DAY)
 
+            if st.checkbox("📏 Bandingkan akurasi dan latensi metode forecasting"):
+                compare_forecasters(df_prophet)
+
+            if st.checkbox("🌱 Forecasting per lubang (hole)"):
+                forecast_per_hole(df_prophet)
+
+            # The whole grid is one batched predict, still only run on request
+            if st.checkbox("🧪 Simulasi skenario lingkungan"):
+                simulate_scenarios(df_prophet)
+
             st.markdown("### 🔎 Detail Variabel")
+            # Per-day statistics, computed once per dataset for every chart below
+            daily = visualization.daily_aggregates(df)
             selected_feature = st.selectbox(
                 "🎯 Pilih fitur untuk divisualisasikan:", df.columns[1:]
             )
-            visualization.visualize_feature(df, selected_feature)
+            visualization.visualize_feature(df, selected_feature, daily=daily)
 
             st.markdown("#### 🆚 Visualisasi Perbandingan Fitur")
             feature_a = st.selectbox("Pilih Fitur A", df.columns[1:])
             feature_b = st.selectbox("Pilih Fitur B", df.columns[2:])
             if feature_a and feature_b:
-                visualization.visualize_comparison(df, feature_a, feature_b)
+                visualization.visualize_comparison(
+                    df, feature_a, feature_b, daily=daily
+                )
 
             # Add Quality Prediction Section
             st.markdown(f"#### Pola Pertumbuhan Tanaman Selada")
@@ -298,7 +387,23 @@ def main():
             # Display loading spinner while the model is being loaded
             with st.spinner("Loading model..."):
                 # Load Model Pola Pertumbuhan Tanaman Selada
-                model_quality, accuracy = model.quality_model()
+                try:
+                    model_quality, accuracy = model.quality_model()
+                except FileNotFoundError as e:
+                    st.error(f"⚠️ Model kualitas belum tersedia: {e}")
+                    return
+
+            # Label the whole uploaded log in one batch, once per dataset
+            patterns, pattern_days = model.log_patterns(
+                model_quality, df, visualization.day_index(df)
+            )
+            st.plotly_chart(visualization.plot_daily_patterns(pattern_days))
+            share = patterns["label"].value_counts(normalize=True) * 100
+            st.caption(
+                " · ".join(f"{label}: {value:.1f}%" for label, value in share.items())
+            )
+            with st.expander("Lihat pola harian"):
+                st.dataframe(pattern_days)
 
             st.write("Enter the values for prediction")
             # Create two columns for inputs
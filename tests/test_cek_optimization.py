@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.cek_optimization import OPTIMAL_CONDITIONS, evaluate_ranges
+
+
+def sensor_frame(n_rows, n_holes, seed):
+    rng = np.random.default_rng(seed)
+    data = {
+        "datetime": pd.Timestamp("2024-07-01")
+        + pd.to_timedelta(rng.permutation(n_rows) * 5, unit="min"),
+        "hole": rng.integers(1, n_holes + 1, n_rows),
+    }
+    for feature, (low, high) in OPTIMAL_CONDITIONS.items():
+        # Roughly half of the readings fall outside the range
+        width = high - low
+        data[feature] = rng.uniform(low - width / 2, high + width / 2, n_rows)
+    return pd.DataFrame(data)
+
+
+def reference_streaks(df, feature):
+    # Walk every hole in time order and count consecutive violations
+    low, high = OPTIMAL_CONDITIONS[feature]
+    longest, start, end = 0, None, None
+    for _, hole in df.sort_values(["hole", "datetime"], kind="mergesort").groupby(
+        "hole", sort=True
+    ):
+        run = 0
+        for time, value in zip(hole["datetime"], hole[feature]):
+            if value < low or value > high:
+                run += 1
+                if run == 1:
+                    run_start = time
+                if run > longest:
+                    longest, start, end = run, run_start, time
+            else:
+                run = 0
+    return longest, start, end
+
+
+@pytest.mark.parametrize("n_rows, n_holes", [(1, 1), (50, 1), (400, 4), (1000, 9)])
+def test_streaks_match_row_by_row_walk(n_rows, n_holes):
+    df = sensor_frame(n_rows, n_holes, seed=n_rows)
+
+    summary = evaluate_ranges(df)["summary"]
+
+    for feature in OPTIMAL_CONDITIONS:
+        longest, start, end = reference_streaks(df, feature)
+        row = summary.loc[feature]
+        assert row["longest_streak"] == longest
+        if longest:
+            assert row["streak_start"] == start
+            assert row["streak_end"] == end
+        else:
+            assert pd.isna(row["streak_start"])
+
+
+def test_summary_matches_per_feature_statistics():
+    df = sensor_frame(300, 3, seed=1)
+
+    evaluation = evaluate_ranges(df)
+
+    for feature, (low, high) in OPTIMAL_CONDITIONS.items():
+        values = df[feature]
+        outside = (values < low) | (values > high)
+        row = evaluation["summary"].loc[feature]
+        assert row["mean"] == round(values.mean(), 2)
+        assert row["violation_fraction"] == pytest.approx(outside.mean())
+        assert row["mean_in_range"] == (low <= values.mean() <= high)
+        np.testing.assert_array_equal(
+            evaluation["timeline"][feature].to_numpy(), outside.to_numpy()
+        )
+
+
+def test_streak_does_not_continue_into_the_next_hole():
+    low, high = OPTIMAL_CONDITIONS["pH"]
+    df = sensor_frame(6, 1, seed=2)
+    df["datetime"] = pd.date_range("2024-07-01", periods=6, freq="h")
+    df["hole"] = [1, 1, 1, 2, 2, 2]
+    df["pH"] = [low, high + 1, high + 1, high + 1, high + 1, low]
+
+    summary = evaluate_ranges(df)["summary"]
+
+    assert summary.loc["pH", "longest_streak"] == 2
+
+
+def test_merged_forecast_columns_are_evaluated():
+    df = sensor_frame(100, 2, seed=3).rename(columns={"pH": "pH_x"})
+
+    summary = evaluate_ranges(df)["summary"]
+
+    expected = evaluate_ranges(df.rename(columns={"pH_x": "pH"}))["summary"]
+    pd.testing.assert_series_equal(summary.loc["pH"], expected.loc["pH"])
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import GradientBoostingClassifier
+
+from utils.compiled_model import CompiledEnsemble, compile_model
+from utils.model import QUALITY_FEATURE_COLUMNS, load_quality_model
+
+
+def small_model(n_classes, init=None):
+    rng = np.random.default_rng(n_classes)
+    X = rng.normal(size=(400, 4))
+    y = np.digitize(X[:, 0] + 0.5 * X[:, 1], np.linspace(-1, 1, n_classes - 1))
+    model = GradientBoostingClassifier(n_estimators=15, max_depth=4, init=init)
+    return model.fit(X, y), rng.normal(size=(200, 4))
+
+
+@pytest.mark.parametrize("n_classes, init", [(2, None), (3, None), (2, "zero")])
+def test_compiled_matches_sklearn(n_classes, init):
+    model, X = small_model(n_classes, init)
+
+    compiled = compile_model(model)
+
+    raw = compiled.decision_function(X)
+    expected = model.decision_function(X)
+    np.testing.assert_allclose(raw.reshape(expected.shape), expected, atol=1e-12)
+    np.testing.assert_allclose(compiled.predict_proba(X), model.predict_proba(X))
+    np.testing.assert_array_equal(compiled.predict(X), model.predict(X))
+
+
+def test_repeated_rows_score_like_distinct_rows():
+    model, X = small_model(3)
+    repeated = np.repeat(X[:20], 10, axis=0)
+
+    compiled = compile_model(model)
+
+    np.testing.assert_array_equal(
+        compiled.predict(repeated), np.repeat(compiled.predict(X[:20]), 10)
+    )
+
+
+def test_saved_quality_model_round_trips(tmp_path):
+    model, _ = load_quality_model()
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(
+        rng.uniform(
+            [22, 40, 500, 5.5, 1000, 450, 22],
+            [31, 80, 4500, 7.5, 2000, 950, 31],
+            (500, 7),
+        ),
+        columns=QUALITY_FEATURE_COLUMNS,
+    )
+
+    path = tmp_path / "quality.npz"
+    compile_model(model).save(path)
+    compiled = CompiledEnsemble.load(path)
+
+    np.testing.assert_array_equal(compiled.predict(X), model.predict(X))
+    np.testing.assert_allclose(
+        compiled.predict_proba(X), model.predict_proba(X), atol=1e-12
+    )
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.downsample import (
+    downsample_frame,
+    downsample_indices,
+    lttb_indices,
+    minmax_indices,
+)
+
+
+def reference_lttb(x, y, n_out):
+    # Straightforward per-bucket loop over the same bucket edges
+    n = len(x)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    buckets = [range(edges[i], edges[i + 1]) for i in range(n_out - 2)]
+
+    selected = [0]
+    for i, bucket in enumerate(buckets):
+        following = buckets[i + 1] if i + 1 < len(buckets) else [n - 1]
+        avg_x = sum(x[j] for j in following) / len(following)
+        avg_y = sum(y[j] for j in following) / len(following)
+        a = selected[-1]
+
+        best, best_area = None, -1.0
+        for j in bucket:
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+
+    selected.append(n - 1)
+    return np.array(selected)
+
+
+def reference_minmax(y, n_out):
+    n = len(y)
+    n_buckets = n_out // 2
+    size = -(-n // n_buckets)
+    keep = {0, n - 1}
+    for start in range(0, n, size):
+        bucket = y[start : start + size]
+        keep.add(start + int(np.argmin(bucket)))
+        keep.add(start + int(np.argmax(bucket)))
+    return np.array(sorted(keep))
+
+
+@pytest.mark.parametrize("n, n_out", [(10, 3), (100, 7), (1000, 50), (997, 101)])
+def test_lttb_matches_reference(n, n_out):
+    rng = np.random.default_rng(n)
+    x = np.sort(rng.uniform(0, 100, n))
+    y = np.cumsum(rng.normal(size=n))
+
+    np.testing.assert_array_equal(
+        lttb_indices(x, y, n_out), reference_lttb(x, y, n_out)
+    )
+
+
+@pytest.mark.parametrize("n, n_out", [(10, 4), (101, 10), (1000, 64), (999, 37)])
+def test_minmax_matches_reference(n, n_out):
+    rng = np.random.default_rng(n)
+    y = rng.normal(size=n)
+
+    np.testing.assert_array_equal(minmax_indices(y, n_out), reference_minmax(y, n_out))
+
+
+def test_minmax_keeps_every_peak():
+    y = np.zeros(1000)
+    y[[17, 503, 998]] = [5.0, -7.0, 3.0]
+
+    keep = minmax_indices(y, 20)
+
+    assert {17, 503, 998} <= set(keep)
+
+
+def test_short_traces_are_kept_whole():
+    x = np.arange(50)
+
+    np.testing.assert_array_equal(lttb_indices(x, x, 100), x)
+    np.testing.assert_array_equal(minmax_indices(x, 100), x)
+    np.testing.assert_array_equal(downsample_indices(x, x, threshold=100), x)
+
+
+def test_downsample_indices_handles_datetimes():
+    x = pd.date_range("2024-07-01", periods=500, freq="min").to_numpy()
+    y = np.sin(np.arange(500) / 10)
+
+    keep = downsample_indices(x, y, n_out=40, threshold=100)
+
+    expected = lttb_indices(x.astype(np.int64), y, 40)
+    np.testing.assert_array_equal(keep, expected)
+
+
+def test_downsample_frame_returns_rows_of_the_frame():
+    df = pd.DataFrame({"x": np.arange(300), "y": np.cos(np.arange(300) / 7)})
+
+    result = downsample_frame(df, "x", "y", n_out=30, threshold=100)
+
+    assert len(result) == 30
+    pd.testing.assert_frame_equal(result, df.loc[result.index])
+    assert downsample_frame(df, "x", "y", threshold=1000) is df
@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+
+from utils.jobs import JobQueue
+
+
+@pytest.fixture
+def queue():
+    queue = JobQueue(max_workers=1, max_pending=2, max_finished=2)
+    yield queue
+    queue.shutdown()
+
+
+def blocked_job(release, calls):
+    def run(value):
+        calls.append(value)
+        release.wait(5)
+        return value * 2
+
+    return run
+
+
+def test_same_key_joins_the_running_job(queue):
+    release, calls = threading.Event(), []
+    run = blocked_job(release, calls)
+
+    first = queue.submit("a", run, 1)
+    second = queue.submit("a", run, 1)
+    release.set()
+
+    assert second is first
+    assert first.result(timeout=5) == 2
+    assert calls == [1]
+    assert queue.stats()["coalesced"] == 1
+
+
+def test_finished_job_is_reused(queue):
+    job = queue.submit("a", lambda: "done")
+    job.result(timeout=5)
+
+    assert queue.submit("a", lambda: "again") is job
+    assert job.status == "done"
+
+
+def test_failed_job_is_retried(queue):
+    def fail():
+        raise ValueError("boom")
+
+    failed = queue.submit("a", fail)
+    with pytest.raises(ValueError):
+        failed.result(timeout=5)
+    assert failed.status == "failed"
+
+    retried = queue.submit("a", lambda: "ok")
+    assert retried is not failed
+    assert retried.result(timeout=5) == "ok"
+
+
+def test_different_keys_run_separately(queue):
+    jobs = [queue.submit(key, lambda key=key: key.upper()) for key in "abc"]
+
+    assert [job.result(timeout=5) for job in jobs] == ["A", "B", "C"]
+    assert queue.stats()["submitted"] == 3
+
+
+def test_full_queue_refuses_new_keys(queue):
+    release, calls = threading.Event(), []
+    run = blocked_job(release, calls)
+    try:
+        queue.submit("running", run, 0)
+        while not calls:
+            time.sleep(0.01)
+        queue.submit("pending-1", run, 1)
+        queue.submit("pending-2", run, 2)
+
+        with pytest.raises(RuntimeError):
+            queue.submit("pending-3", run, 3)
+        # Joining an existing key still works when the queue is full
+        assert queue.submit("pending-1", run, 1).key == "pending-1"
+    finally:
+        release.set()
+
+
+def test_old_finished_jobs_are_evicted(queue):
+    # One worker runs each job's done callback before it starts the next job
+    for key in "abcd":
+        queue.submit(key, lambda: None).result(timeout=5)
+
+    assert queue.get("a") is None
+    assert queue.get("c") is not None
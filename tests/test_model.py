@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from scipy.optimize import curve_fit
+
+from utils.model import fit_logistic_growth, logistic_growth
+
+
+def test_fit_logistic_growth_recovers_exact_curve():
+    t = np.linspace(0, 30, 200)
+    y = logistic_growth(t, -3.0, 0.25)
+
+    a, b = fit_logistic_growth(t, y)
+
+    assert a == pytest.approx(-3.0, abs=1e-6)
+    assert b == pytest.approx(0.25, abs=1e-6)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_fit_logistic_growth_matches_least_squares(seed):
+    # Noisy, rounded leaf counts like a real log, including 0 and the cap
+    rng = np.random.default_rng(seed)
+    t = np.sort(rng.uniform(0, 40, 800))
+    y = np.clip(np.round(logistic_growth(t, -2.5, 0.2) + rng.normal(0, 1, 800)), 0, 18)
+
+    a, b = fit_logistic_growth(t, y)
+
+    (a_ref, b_ref), _ = curve_fit(
+        lambda t, a, b: logistic_growth(t, a, b), t, y, p0=(0.0, 0.1)
+    )
+    assert a == pytest.approx(a_ref, rel=1e-4)
+    assert b == pytest.approx(b_ref, rel=1e-4)
+
+
+def test_fit_logistic_growth_uses_the_given_cap():
+    t = np.arange(20.0)
+    y = logistic_growth(t, -1.0, 0.3, cap=30)
+
+    a, b = fit_logistic_growth(t, y, cap=30)
+
+    assert (a, b) == pytest.approx((-1.0, 0.3), abs=1e-6)
+
+
+def test_fit_logistic_growth_needs_more_than_one_time():
+    with pytest.raises(ValueError):
+        fit_logistic_growth([5.0, 5.0, 5.0], [3.0, 4.0, 5.0])
@@ -0,0 +1,100 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.preprocessing import (
+    MAX_HOLE,
+    START_DATE,
+    build_datetime,
+    preprocess_data,
+    read_sensor_csv,
+)
+
+
+def reference_datetime(day, time):
+    # Row-by-row conversion the Forecasting page used before build_datetime
+    clock = pd.to_datetime("{:.2f}".format(time), format="%H.%M").time()
+    return START_DATE + pd.Timedelta(days=int(day) - 1) + pd.to_timedelta(str(clock))
+
+
+def test_build_datetime_matches_row_by_row_conversion():
+    rng = np.random.default_rng(0)
+    day = rng.integers(1, 41, 500)
+    time = rng.integers(0, 24, 500) + rng.integers(0, 60, 500) / 100
+
+    result = build_datetime(day, time)
+
+    expected = [reference_datetime(d, t) for d, t in zip(day, time)]
+    assert list(result) == expected
+
+
+def test_build_datetime_rounds_like_two_decimal_formatting():
+    # 9.19 is stored as 9.1899999...; both must read it as 09:19
+    result = build_datetime([1, 2], [9.19, 23.59])
+
+    assert list(result) == [
+        pd.Timestamp("2024-07-01 09:19"),
+        pd.Timestamp("2024-07-02 23:59"),
+    ]
+
+
+def test_build_datetime_accepts_numeric_strings():
+    result = build_datetime(pd.Series([3]), pd.Series(["7.05"]))
+
+    assert list(result) == [pd.Timestamp("2024-07-03 07:05")]
+
+
+@pytest.mark.parametrize("time", [[9.75], [24.0], [-1.0], [np.nan], ["abc"]])
+def test_build_datetime_rejects_invalid_times(time):
+    with pytest.raises(ValueError):
+        build_datetime([1], time)
+
+
+def sensor_csv(holes, n_rows=300, seed=0):
+    # A day/time export that repeats every reading, like the field logs
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "day": rng.integers(1, 4, n_rows),
+            "hole": rng.choice(holes, n_rows),
+            "time": rng.integers(0, 24, n_rows) + rng.integers(0, 60, n_rows) / 100,
+            "temperature": rng.uniform(20, 32, n_rows).round(1),
+            "humidity": rng.integers(50, 90, n_rows),
+            "light": rng.integers(0, 40000, n_rows),
+            "pH": rng.uniform(5, 8, n_rows).round(1),
+            "EC": rng.integers(500, 1500, n_rows),
+            "TDS": rng.integers(250, 750, n_rows),
+            "WaterTemp": rng.uniform(20, 30, n_rows).round(1),
+            "Label": "x",
+            "LeafCount": rng.integers(0, 19, n_rows),
+        }
+    )
+    return pd.concat([df, df]).to_csv(index=False)
+
+
+@pytest.mark.parametrize("chunksize", [7, 100, 100_000])
+def test_read_sensor_csv_matches_whole_file_read(chunksize):
+    text = sensor_csv(holes=[1, 2, 3])
+
+    result = read_sensor_csv(io.StringIO(text), chunksize=chunksize)
+
+    expected = preprocess_data(pd.read_csv(io.StringIO(text)))
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert result["hole"].dtype == np.int8
+    # Decimal readings stay float64, exact integers are narrowed
+    assert result["temperature"].dtype == np.float64
+    assert result["light"].dtype == np.int32
+
+
+def test_read_sensor_csv_does_not_wrap_large_holes():
+    result = read_sensor_csv(io.StringIO(sensor_csv(holes=[1, 200])), chunksize=50)
+
+    assert set(result["hole"]) == {1, 200}
+
+
+@pytest.mark.parametrize("hole", [0, -3, 2.5, MAX_HOLE + 1])
+def test_read_sensor_csv_rejects_invalid_holes(hole):
+    with pytest.raises(ValueError, match="hole"):
+        read_sensor_csv(io.StringIO(sensor_csv(holes=[1, hole])))
@@ -0,0 +1,76 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.model import QUALITY_FEATURE_COLUMNS, classify_patterns, load_quality_model
+from utils.service import ClassifierBatcher, ModelPool, RequestError
+
+
+def readings(n_rows, seed):
+    rng = np.random.default_rng(seed)
+    low = np.array([22, 40, 500, 5.5, 1000, 450, 22])
+    high = np.array([31, 80, 4500, 7.5, 2000, 950, 31])
+    values = rng.uniform(low, high, (n_rows, len(QUALITY_FEATURE_COLUMNS)))
+    # Offset index: results must come back on the request's own index
+    index = pd.RangeIndex(100 * seed, 100 * seed + n_rows)
+    return pd.DataFrame(values, columns=QUALITY_FEATURE_COLUMNS, index=index)
+
+
+def classify_all(frames, **options):
+    async def run():
+        batcher = ClassifierBatcher(ModelPool(), **options)
+        batcher.start()
+        try:
+            results = await asyncio.gather(
+                *(batcher.classify(frame) for frame in frames), return_exceptions=True
+            )
+        finally:
+            await batcher.stop()
+        return results, batcher.stats()
+
+    return asyncio.run(run())
+
+
+@pytest.fixture(scope="module")
+def quality_model():
+    return load_quality_model()[0]
+
+
+def test_batched_results_match_per_request_scoring(quality_model):
+    frames = [readings(n, seed) for seed, n in enumerate([1, 5, 3, 40])]
+
+    results, stats = classify_all(frames)
+
+    for frame, result in zip(frames, results):
+        pd.testing.assert_frame_equal(result, classify_patterns(quality_model, frame))
+    assert stats["batches"] == 1
+    assert stats["requests"] == len(frames)
+    assert stats["rows"] == 49
+
+
+def test_max_rows_splits_batches_in_arrival_order(quality_model):
+    frames = [readings(3, seed) for seed in range(5)]
+
+    results, stats = classify_all(frames, max_rows=5)
+
+    for frame, result in zip(frames, results):
+        pd.testing.assert_frame_equal(result, classify_patterns(quality_model, frame))
+    # 3 + 3 rows reach max_rows, so batches of 2, 2 and 1 requests
+    assert stats["batches"] == 3
+    assert stats["largest_batch"] == 2
+
+
+def test_invalid_request_does_not_fail_its_batch(quality_model):
+    good = readings(4, 1)
+    missing = good.drop(columns=["pH"])
+    text = good.astype(object)
+    text.iloc[0, 0] = "panas"
+
+    results, stats = classify_all([good, missing, text])
+
+    pd.testing.assert_frame_equal(results[0], classify_patterns(quality_model, good))
+    assert isinstance(results[1], RequestError)
+    assert isinstance(results[2], RequestError)
+    assert stats["requests"] == 1
@@ -1,17 +1,137 @@
-from .model import (
-    load_model,
-    prepare_data,
-    create_future_dataframe,
-    make_predictions,
-    quality_model,
-    predict_pattern,
-)
-from .visualization import (
-    plot_forecast,
-    plot_growth_bar,
-    calculate_growth_percentage,
-    visualize_feature,
-    visaulize_all_features,
-    visualize_comparison,
-)
-from .cek_optimization import check_optimization, summarize_forecast
+"""Hydrosim helpers.
+
+Public helpers are imported from their submodule on first access, so pages
+that only need e.g. `from utils import assets` do not load Prophet and
+scikit-learn.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "model": [
+        "load_model",
+        "model_fingerprint",
+        "model_cache_stats",
+        "clear_model_cache",
+        "prepare_data",
+        "create_future_dataframe",
+        "make_predictions",
+        "predict_point",
+        "dataset_fingerprint",
+        "forecast_full_horizon",
+        "forecast_key",
+        "Forecaster",
+        "ProphetForecaster",
+        "LogisticForecaster",
+        "ArimaForecaster",
+        "FORECASTERS",
+        "get_forecaster",
+        "available_forecasters",
+        "forecaster_stats",
+        "evaluate_forecasters",
+        "fit_logistic_growth",
+        "submit_forecast_job",
+        "claim_job_timer",
+        "slice_forecast",
+        "quality_model",
+        "train_quality_model",
+        "load_quality_model",
+        "export_quality_model",
+        "predict_pattern",
+        "classify_patterns",
+        "log_patterns",
+        "daily_patterns",
+        "PATTERN_LABELS",
+    ],
+    "visualization": [
+        "plot_forecast",
+        "plot_growth_bar",
+        "plot_hole_forecasts",
+        "plot_scenario_heatmap",
+        "plot_violation_timeline",
+        "plot_daily_patterns",
+        "calculate_growth_percentage",
+        "visualize_feature",
+        "visaulize_all_features",
+        "visualize_comparison",
+        "build_daily_aggregates",
+        "daily_aggregates",
+    ],
+    "cek_optimization": [
+        "OPTIMAL_CONDITIONS",
+        "check_optimization",
+        "evaluate_ranges",
+        "summarize_forecast",
+        "violation_timeline",
+    ],
+    "preprocessing": [
+        "build_datetime",
+        "add_datetime_from_day_time",
+        "preprocess_data",
+        "read_sensor_csv",
+    ],
+    "forecast_cache": [
+        "ForecastCache",
+        "forecast_cache_key",
+        "get_forecast_cache",
+    ],
+    "instrumentation": [
+        "StageTimer",
+        "configure_timing_log",
+        "register_timing_hook",
+        "unregister_timing_hook",
+    ],
+    "jobs": [
+        "Job",
+        "JobQueue",
+        "get_job_queue",
+    ],
+    "hole_forecast": [
+        "forecast_per_hole",
+        "aggregate_hole_forecasts",
+    ],
+    "assets": [
+        "asset_path",
+        "asset_srcset",
+        "asset_url",
+        "build_assets",
+    ],
+    "compiled_model": [
+        "CompiledEnsemble",
+        "compile_model",
+    ],
+    "downsample": [
+        "downsample_xy",
+        "downsample_frame",
+        "lttb_indices",
+        "minmax_indices",
+    ],
+    "datasets": [
+        "load_dataset",
+        "convert_dataset",
+        "convert_all",
+        "resolve_data_source",
+    ],
+    "scenario": [
+        "scenario_grid",
+        "build_scenario_future",
+        "simulate_scenarios",
+        "scenario_cube",
+    ],
+}
+_SUBMODULE_OF = {name: module for module, names in _EXPORTS.items() for name in names}
+__all__ = list(_SUBMODULE_OF)
+
+
+def __getattr__(name):
+    module = _SUBMODULE_OF.get(name)
+    if module is None:
+        # Submodules (from utils import model) are found by the import system
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
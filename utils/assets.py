@@ -0,0 +1,196 @@
+import base64
+import hashlib
+import json
+import os
+import threading
+
+import streamlit as st
+
+ASSET_DIR = "./assets"
+# Streamlit serves ./static at app/static/ when server.enableStaticServing is on
+STATIC_DIR = "./static"
+STATIC_URL = "app/static"
+ASSET_MANIFEST_PATH = os.path.join(STATIC_DIR, "assets.json")
+
+# Widths generated per image (never wider than the source)
+ASSET_WIDTHS = (320, 800, 1600)
+WEBP_QUALITY = 80
+
+_MANIFEST_LOCK = threading.Lock()
+_MANIFEST_CACHE = {"stat": None, "manifest": None}
+_DATA_URI_CACHE = {}
+
+
+def _sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _variant_widths(width):
+    widths = [w for w in ASSET_WIDTHS if w < width]
+    if width <= max(ASSET_WIDTHS):
+        widths.append(width)
+    return widths
+
+
+def _encode_variant(image, width, source_name, static_dir):
+    # Resize, encode as WebP and name the file after its content hash
+    from io import BytesIO
+
+    from PIL import Image
+
+    if width < image.width:
+        height = round(image.height * width / image.width)
+        image = image.resize((width, height), Image.LANCZOS)
+
+    buffer = BytesIO()
+    image.save(buffer, "WEBP", quality=WEBP_QUALITY)
+    data = buffer.getvalue()
+
+    stem = os.path.splitext(source_name)[0]
+    file_name = f"{stem}-{width}.{hashlib.sha256(data).hexdigest()[:10]}.webp"
+    path = os.path.join(static_dir, file_name)
+    if not os.path.exists(path):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    return {
+        "width": width,
+        "height": image.height,
+        "file": file_name,
+        "bytes": len(data),
+    }
+
+
+def build_assets(asset_dir=ASSET_DIR, static_dir=STATIC_DIR):
+    """Generate resized WebP variants of every image in asset_dir.
+
+    Variants are written to static_dir with a content hash in the file name,
+    so browsers can cache them forever; assets.json maps each source image to
+    its variants. Images whose content did not change are skipped and variants
+    no longer referenced are removed.
+    """
+    from PIL import Image
+
+    os.makedirs(static_dir, exist_ok=True)
+    manifest_path = os.path.join(static_dir, os.path.basename(ASSET_MANIFEST_PATH))
+    previous = read_asset_manifest(manifest_path)
+
+    assets = {}
+    for name in sorted(os.listdir(asset_dir)):
+        if not name.lower().endswith((".png", ".jpg", ".jpeg")):
+            continue
+        source = os.path.join(asset_dir, name)
+        source_sha = _sha256(source)
+
+        entry = previous.get(name)
+        if entry is not None and entry["source_sha256"] == source_sha:
+            if all(
+                os.path.exists(os.path.join(static_dir, v["file"]))
+                for v in entry["variants"]
+            ):
+                assets[name] = entry
+                continue
+
+        with Image.open(source) as image:
+            image.load()
+            # Palette images are converted so WebP keeps their transparency
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA")
+            variants = [
+                _encode_variant(image, width, name, static_dir)
+                for width in _variant_widths(image.width)
+            ]
+            assets[name] = {
+                "source_sha256": source_sha,
+                "source_bytes": os.path.getsize(source),
+                "width": image.width,
+                "height": image.height,
+                "variants": variants,
+            }
+
+    # Drop variants that no manifest entry points to anymore
+    referenced = {v["file"] for entry in assets.values() for v in entry["variants"]}
+    for name in os.listdir(static_dir):
+        if name.endswith(".webp") and name not in referenced:
+            os.remove(os.path.join(static_dir, name))
+
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"assets": assets}, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+    return assets
+
+
+def read_asset_manifest(manifest_path=ASSET_MANIFEST_PATH):
+    """Asset entries of assets.json, re-read only when the file changes."""
+    try:
+        stat = os.stat(manifest_path)
+    except FileNotFoundError:
+        return {}
+
+    key = (os.path.abspath(manifest_path), stat.st_mtime_ns, stat.st_size)
+    with _MANIFEST_LOCK:
+        if _MANIFEST_CACHE["stat"] != key:
+            with open(manifest_path) as f:
+                _MANIFEST_CACHE["manifest"] = json.load(f)["assets"]
+            _MANIFEST_CACHE["stat"] = key
+        return _MANIFEST_CACHE["manifest"]
+
+
+def _variant(name, width):
+    # Smallest variant at least `width` wide, else the largest one
+    entry = read_asset_manifest().get(name)
+    if entry is None:
+        return None
+    variants = entry["variants"]
+    if width is None:
+        return variants[-1]
+    for variant in variants:
+        if variant["width"] >= width:
+            return variant
+    return variants[-1]
+
+
+def asset_path(name, width=None):
+    """Local file for st.image/page_icon: a built variant, else the original."""
+    variant = _variant(name, width)
+    if variant is not None:
+        path = os.path.join(STATIC_DIR, variant["file"])
+        if os.path.exists(path):
+            return path
+    return os.path.join(ASSET_DIR, name)
+
+
+def _data_uri(path):
+    if path not in _DATA_URI_CACHE:
+        mime = "image/webp" if path.endswith(".webp") else "image/png"
+        with open(path, "rb") as f:
+            encoded = base64.b64encode(f.read()).decode("ascii")
+        _DATA_URI_CACHE[path] = f"data:{mime};base64,{encoded}"
+    return _DATA_URI_CACHE[path]
+
+
+def asset_url(name, width=None):
+    """URL for markdown/HTML <img>, served locally without any network access.
+
+    Uses the hashed static file when Streamlit serves ./static, otherwise
+    inlines the file as a data URI.
+    """
+    variant = _variant(name, width)
+    if variant is not None and st.get_option("server.enableStaticServing"):
+        return f"{STATIC_URL}/{variant['file']}"
+    return _data_uri(asset_path(name, width))
+
+
+def asset_srcset(name):
+    """srcset attribute value listing every variant, for responsive <img> tags."""
+    entry = read_asset_manifest().get(name)
+    if entry is None or not st.get_option("server.enableStaticServing"):
+        return ""
+    return ", ".join(
+        f"{STATIC_URL}/{v['file']} {v['width']}w" for v in entry["variants"]
+    )
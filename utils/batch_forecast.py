@@ -0,0 +1,146 @@
+"""Headless batch forecasting for many greenhouse CSV exports.
+
+    python -m utils.batch_forecast dataset/ "exports/*.csv" --out forecasts/
+
+Each file goes through preprocess_data -> prepare_data -> forecast ->
+summarize_forecast/check_optimization on a worker pool. The combined forecasts
+and conclusions are written to the output directory as Parquet (default) or CSV.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from .datasets import load_dataset
+from .cek_optimization import check_optimization, summarize_forecast
+from .model import (
+    FORECASTERS,
+    MAX_DAY,
+    PROPHET_MODEL_PATH,
+    forecast_full_horizon,
+    prepare_data,
+)
+from .preprocessing import preprocess_data
+
+
+def expand_inputs(inputs):
+    """Resolve directories, globs and plain paths into a sorted list of CSV files."""
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.update(glob.glob(os.path.join(item, "*.csv")))
+        elif glob.has_magic(item):
+            paths.update(glob.glob(item))
+        else:
+            paths.add(item)
+    return sorted(paths)
+
+
+def forecast_file(
+    path, periods=MAX_DAY, model_path=PROPHET_MODEL_PATH, backend="prophet"
+):
+    """Run the Forecasting page pipeline on one CSV file."""
+    df = preprocess_data(load_dataset(path))
+    df_prophet = prepare_data(df)
+    forecast = forecast_full_horizon(
+        df_prophet, model_path=model_path, max_day=periods, backend=backend
+    )
+
+    conclusions = [summarize_forecast(df, forecast, periods)]
+    conclusions += check_optimization(df)
+
+    forecast = forecast[["ds", "yhat", "yhat_lower", "yhat_upper"]].copy()
+    forecast.insert(0, "source", path)
+    conclusions = pd.DataFrame(
+        {
+            "source": path,
+            "kind": ["summary"] + ["optimization"] * (len(conclusions) - 1),
+            "text": conclusions,
+        }
+    )
+    return forecast, conclusions
+
+
+def write_frame(df, out_dir, name, fmt):
+    path = os.path.join(out_dir, f"{name}.{fmt}")
+    if fmt == "parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Forecasting banyak file CSV sekaligus tanpa Streamlit."
+    )
+    parser.add_argument("inputs", nargs="+", help="file CSV, direktori, atau glob")
+    parser.add_argument("--out", default="./forecasts", help="direktori output")
+    parser.add_argument("--format", choices=["parquet", "csv"], default="parquet")
+    parser.add_argument("--periods", type=int, default=MAX_DAY)
+    parser.add_argument("--model", default=PROPHET_MODEL_PATH)
+    parser.add_argument("--backend", choices=list(FORECASTERS), default="prophet")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        parser.error("tidak ada file CSV yang cocok")
+
+    start = time.perf_counter()
+    forecasts, conclusions, failures = [], [], []
+
+    # Each worker process loads the model once through the model registry
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = {
+            executor.submit(
+                forecast_file, path, args.periods, args.model, args.backend
+            ): path
+            for path in paths
+        }
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                forecast, conclusion = future.result()
+            except Exception as e:
+                failures.append(path)
+                print(f"GAGAL {path}: {e}", file=sys.stderr)
+                continue
+            forecasts.append(forecast)
+            conclusions.append(conclusion)
+            print(f"OK    {path}")
+
+    elapsed = time.perf_counter() - start
+
+    os.makedirs(args.out, exist_ok=True)
+    if forecasts:
+        sort_keys = ["source", "ds"]
+        forecast_path = write_frame(
+            pd.concat(forecasts).sort_values(sort_keys),
+            args.out,
+            "forecasts",
+            args.format,
+        )
+        conclusion_path = write_frame(
+            pd.concat(conclusions).sort_values("source", kind="mergesort"),
+            args.out,
+            "conclusions",
+            args.format,
+        )
+        print(f"Forecast disimpan ke {forecast_path} dan {conclusion_path}")
+
+    done = len(paths) - len(failures)
+    print(
+        f"{done}/{len(paths)} file dalam {elapsed:.2f} s "
+        f"({done / elapsed:.2f} file/s, {args.workers} worker)"
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
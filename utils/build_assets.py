@@ -0,0 +1,25 @@
+import argparse
+
+from .assets import ASSET_DIR, STATIC_DIR, build_assets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Buat varian WebP (ukuran kecil, nama ber-hash) dari folder assets/."
+    )
+    parser.add_argument("--assets", default=ASSET_DIR)
+    parser.add_argument("--static", default=STATIC_DIR)
+    args = parser.parse_args(argv)
+
+    assets = build_assets(args.assets, args.static)
+
+    source_bytes = sum(entry["source_bytes"] for entry in assets.values())
+    variant_bytes = sum(entry["variants"][-1]["bytes"] for entry in assets.values())
+    print(
+        f"{len(assets)} gambar di {args.static}: {source_bytes / 1e6:.2f} MB PNG -> "
+        f"{variant_bytes / 1e6:.2f} MB WebP (varian terbesar)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,139 @@
+import numpy as np
 import pandas as pd
 
+# Optimal range for each sensor feature
+OPTIMAL_CONDITIONS = {
+    "temperature": (25, 28),
+    "humidity": (50, 70),
+    "light": (1000, 4000),
+    "pH": (6.0, 7.0),
+    "EC": (1200, 1800),
+    "TDS": (560, 840),
+    "WaterTemp": (25, 28),
+}
 
-def check_optimization(df):
-    # Calculate the mean of each feature
-    means = df.mean().round(2)
-
-    # Define optimal ranges for each feature
-    optimal_conditions = {
-        "temperature_x": (25, 28),
-        "humidity_x": (50, 70),
-        "light_x": (1000, 4000),
-        "pH_x": (6.0, 7.0),
-        "EC_x": (1200, 1800),
-        "TDS_x": (560, 840),
-        "WaterTemp_x": (25, 28),
-    }
-
-    # Determine if each feature is within optimal range
-    def check_optimal(feature, value):
-        if feature in optimal_conditions:
-            lower, upper = optimal_conditions[feature]
-            return lower <= value <= upper
-        return True  # Always optimal if no specific range
+
+def _feature_columns(df, ranges):
+    # Plain names first; '_x' columns of a df_prophet/forecast merge still work
+    columns = {}
+    for feature in ranges:
+        if feature in df.columns:
+            columns[feature] = feature
+        elif f"{feature}_x" in df.columns:
+            columns[feature] = f"{feature}_x"
+    return columns
+
+
+def _time_column(df):
+    for column in ("datetime", "ds"):
+        if column in df.columns:
+            return column
+    return None
+
+
+def evaluate_ranges(df, ranges=OPTIMAL_CONDITIONS, group_column="hole"):
+    """Score every row of a sensor frame against the optimal ranges in one pass.
+
+    Returns a dict with
+      "summary":  per feature mean, range, violation fraction, whether the mean
+                  is in range, and the longest run of consecutive out-of-range
+                  readings (per hole when a 'hole' column exists) with its
+                  start/end time;
+      "timeline": boolean frame, True where a reading is out of range, indexed
+                  by time when the frame has a 'datetime'/'ds' column.
+    """
+    columns = _feature_columns(df, ranges)
+    features = list(columns)
+    time_column = _time_column(df)
+
+    values = df[[columns[f] for f in features]].to_numpy(dtype=float)
+    lower = np.array([ranges[f][0] for f in features], dtype=float)
+    upper = np.array([ranges[f][1] for f in features], dtype=float)
+    out_of_range = (values < lower) | (values > upper)
+
+    # Streaks follow time within each hole
+    sort_keys = []
+    if time_column is not None:
+        sort_keys.append(df[time_column].to_numpy())
+    if group_column in df.columns:
+        groups = df[group_column].to_numpy()
+        sort_keys.append(groups)
+    order = np.lexsort(sort_keys) if sort_keys else np.arange(len(df))
+
+    ordered = out_of_range[order]
+    n_rows = len(ordered)
+    starts_group = np.zeros(n_rows, dtype=bool)
+    if n_rows:
+        starts_group[0] = True
+    if group_column in df.columns and n_rows:
+        starts_group[1:] = groups[order][1:] != groups[order][:-1]
+
+    # Run length ending at each row: distance to the last in-range row or hole start
+    index = np.arange(n_rows)[:, None]
+    resets = np.where(~ordered, index, -1)
+    resets = np.maximum(resets, np.where(starts_group[:, None], index - 1, -1))
+    runs = np.where(ordered, index - np.maximum.accumulate(resets, axis=0), 0)
+
+    longest = runs.max(axis=0) if n_rows else np.zeros(len(features), dtype=int)
+    streak_end = runs.argmax(axis=0) if n_rows else np.zeros(len(features), dtype=int)
+
+    means = np.nanmean(values, axis=0) if n_rows else np.full(len(features), np.nan)
+    summary = pd.DataFrame(
+        {
+            "mean": means.round(2),
+            "lower": lower,
+            "upper": upper,
+            "mean_in_range": (means >= lower) & (means <= upper),
+            "violation_fraction": out_of_range.mean(axis=0) if n_rows else 0.0,
+            "longest_streak": longest,
+        },
+        index=pd.Index(features, name="feature"),
+    )
+    if time_column is not None and n_rows:
+        times = df[time_column].to_numpy()[order]
+        has_streak = longest > 0
+        summary["streak_start"] = pd.NaT
+        summary["streak_end"] = pd.NaT
+        summary.loc[has_streak, "streak_start"] = times[
+            (streak_end - longest + 1)[has_streak]
+        ]
+        summary.loc[has_streak, "streak_end"] = times[streak_end[has_streak]]
+
+    timeline = pd.DataFrame(out_of_range, columns=features)
+    if time_column is not None:
+        timeline.index = pd.DatetimeIndex(df[time_column], name=time_column)
+
+    return {"summary": summary, "timeline": timeline}
+
+
+def violation_timeline(timeline, freq="D"):
+    """Fraction of out-of-range readings per period (default: per day)."""
+    return timeline.astype(float).resample(freq).mean()
+
+
+def check_optimization(df, evaluation=None):
+    # Pass the result of evaluate_ranges(df) to avoid scoring the frame twice
+    if evaluation is None:
+        evaluation = evaluate_ranges(df)
+    summary = evaluation["summary"]
 
     # Generate conclusions for each feature
     conclusions = []
-    for feature, mean_value in means.items():
-        is_optimal = check_optimal(feature, mean_value)
+    for feature, row in summary.iterrows():
+        mean_value = row["mean"]
+        share = f"{row['violation_fraction'] * 100:.1f}%"
 
-        if is_optimal:
+        if row["mean_in_range"]:
             # Positive statement if the feature is within optimal range
             conclusions.append(
-                f"✔️ Rata-rata {feature} dalam kondisi ideal pada nilai {mean_value}. Kondisi ini mendukung pertumbuhan optimal 🌱."
+                f"✔️ Rata-rata {feature} dalam kondisi ideal pada nilai {mean_value}. Kondisi ini mendukung pertumbuhan optimal 🌱. "
+                f"({share} data di luar rentang ideal)"
             )
         else:
             # Normative statement without suggesting specific ranges
             conclusions.append(
-                f"⚠️ Rata-rata {feature} tercatat pada {mean_value}. Memerlukan perhatian untuk mencapai kondisi yang lebih mendukung."
+                f"⚠️ Rata-rata {feature} tercatat pada {mean_value}. Memerlukan perhatian untuk mencapai kondisi yang lebih mendukung. "
+                f"({share} data di luar rentang ideal)"
             )
 
     return conclusions
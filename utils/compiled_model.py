@@ -0,0 +1,215 @@
+import numpy as np
+
+# Rows scored per block: bounds the (rows x trees) node-index matrix
+COMPILED_BATCH_ROWS = 4096
+
+
+def _init_raw(model):
+    """Constant raw score the ensemble starts from, from the public init_ estimator.
+
+    Mirrors sklearn's log-loss link: the clipped prior probabilities go through
+    the logit (binary) or a mean-centred log (multiclass).
+    """
+    n_outputs = model.estimators_.shape[1]
+    if isinstance(model.init_, str) and model.init_ == "zero":
+        return np.zeros(n_outputs)
+
+    # The default init (a prior DummyClassifier) ignores the feature values
+    proba = model.init_.predict_proba(np.zeros((1, model.n_features_in_)))[0]
+    eps = np.finfo(np.float32).eps
+    proba = np.clip(proba, eps, 1 - eps, dtype=np.float64)
+    if n_outputs == 1:
+        return np.array([np.log(proba[1] / (1 - proba[1]))])
+    log_proba = np.log(proba)
+    return log_proba - log_proba.mean()
+
+
+class CompiledEnsemble:
+    """Array-backed copy of a fitted GradientBoostingClassifier.
+
+    All regression trees are flattened into shared node arrays. sklearn builds
+    trees depth-first, so a split's left child is always the next node and only
+    the right child is stored. Leaves send every row right, to themselves, so a
+    batch walks all trees at once in `max_depth` vectorized steps.
+
+    Split thresholds are replaced by their rank among the sorted thresholds of
+    the same feature. Inputs are binned once per feature with searchsorted
+    (after the float32 cast sklearn's trees also apply), which keeps every
+    comparison exact. Rows with the same bins take the same path through every
+    tree, so only distinct binned rows are traversed; quantized sensor logs
+    repeat a lot of readings.
+    """
+
+    def __init__(
+        self,
+        feature,
+        rank,
+        right,
+        value,
+        roots,
+        thresholds,
+        threshold_offsets,
+        init_raw,
+        learning_rate,
+        classes,
+        feature_names,
+        max_depth,
+    ):
+        self.feature = feature
+        self.rank = rank
+        self.right = right
+        self.value = value
+        # roots has shape (n_estimators, n_trees_per_stage)
+        self.roots = roots
+        # Sorted unique thresholds of feature f: thresholds[offsets[f]:offsets[f+1]]
+        self.thresholds = thresholds
+        self.threshold_offsets = threshold_offsets
+        self.init_raw = init_raw
+        self.learning_rate = float(learning_rate)
+        self.classes_ = classes
+        self.feature_names_in_ = feature_names
+        self.max_depth = int(max_depth)
+
+    @classmethod
+    def from_sklearn(cls, model):
+        n_features = model.n_features_in_
+        trees = [tree.tree_ for tree in model.estimators_.ravel()]
+
+        sizes = np.array([tree.node_count for tree in trees])
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        feature = np.concatenate([tree.feature for tree in trees])
+        threshold = np.concatenate([tree.threshold for tree in trees])
+        left = np.concatenate([t.children_left + o for t, o in zip(trees, offsets)])
+        right = np.concatenate([t.children_right + o for t, o in zip(trees, offsets)])
+        value = np.concatenate([tree.value[:, 0, 0] for tree in trees])
+
+        is_leaf = np.concatenate([tree.children_left == -1 for tree in trees])
+        node_ids = np.arange(len(feature))
+        if not np.array_equal(left[~is_leaf], node_ids[~is_leaf] + 1):
+            raise ValueError(
+                "Pohon tidak tersusun depth-first, tidak dapat dikompilasi."
+            )
+
+        # Rank of each split threshold among its feature's sorted thresholds
+        rank = np.full(len(feature), -1, dtype=np.int32)
+        per_feature = []
+        for f in range(n_features):
+            splits = ~is_leaf & (feature == f)
+            unique, inverse = np.unique(threshold[splits], return_inverse=True)
+            rank[splits] = inverse
+            per_feature.append(unique)
+
+        return cls(
+            feature=np.where(is_leaf, 0, feature).astype(np.int8),
+            rank=rank,
+            right=np.where(is_leaf, node_ids, right).astype(np.int32),
+            value=value.astype(np.float64),
+            roots=offsets.reshape(model.estimators_.shape).astype(np.int32),
+            thresholds=np.concatenate(per_feature),
+            threshold_offsets=np.cumsum([0] + [len(t) for t in per_feature]),
+            init_raw=_init_raw(model),
+            learning_rate=model.learning_rate,
+            classes=np.asarray(model.classes_),
+            feature_names=np.asarray(
+                getattr(model, "feature_names_in_", np.arange(n_features)),
+                dtype=object,
+            ),
+            max_depth=max(tree.max_depth for tree in trees),
+        )
+
+    def save(self, path):
+        np.savez_compressed(
+            path,
+            feature=self.feature,
+            rank=self.rank,
+            right=self.right,
+            value=self.value,
+            roots=self.roots,
+            thresholds=self.thresholds,
+            threshold_offsets=self.threshold_offsets,
+            init_raw=self.init_raw,
+            learning_rate=self.learning_rate,
+            classes=self.classes_,
+            feature_names=self.feature_names_in_.astype(str),
+            max_depth=self.max_depth,
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            fields = {name: data[name] for name in data.files}
+        fields["feature_names"] = fields["feature_names"].astype(object)
+        return cls(**fields)
+
+    def _features(self, X):
+        # DataFrames are reordered to the training columns, arrays taken as-is
+        if hasattr(X, "columns"):
+            X = X[list(self.feature_names_in_)]
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        return X
+
+    def _bins(self, X):
+        # bin <= rank  <=>  x <= threshold, for every split on that feature
+        bins = np.empty(X.shape, dtype=np.int32)
+        for f in range(X.shape[1]):
+            start, stop = self.threshold_offsets[f], self.threshold_offsets[f + 1]
+            bins[:, f] = np.searchsorted(
+                self.thresholds[start:stop], X[:, f].astype(np.float64), side="left"
+            )
+        return bins
+
+    def _traverse(self, bins):
+        n_stages, n_per_stage = self.roots.shape
+        roots = self.roots.ravel()
+        raw = np.empty((len(bins), n_per_stage), dtype=np.float64)
+
+        for start in range(0, len(bins), COMPILED_BATCH_ROWS):
+            block = bins[start : start + COMPILED_BATCH_ROWS]
+            flat = block.ravel()
+            row_base = (np.arange(len(block)) * block.shape[1])[:, None]
+            nodes = np.tile(roots, (len(block), 1))
+
+            for _ in range(self.max_depth):
+                go_right = flat[row_base + self.feature[nodes]] > self.rank[nodes]
+                nodes = np.where(go_right, self.right[nodes], nodes + 1)
+
+            # Sum leaf values stage by stage, per class column
+            leaves = self.value[nodes].reshape(len(block), n_stages, n_per_stage)
+            raw[start : start + len(block)] = leaves.sum(axis=1)
+
+        return self.init_raw + self.learning_rate * raw
+
+    def decision_function(self, X):
+        bins = self._bins(self._features(X))
+
+        # Score each distinct binned row once
+        keys = np.ascontiguousarray(bins).view(
+            np.dtype((np.void, bins.dtype.itemsize * bins.shape[1]))
+        )[:, 0]
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+        return self._traverse(bins[first])[inverse.ravel()]
+
+    def predict_proba(self, X):
+        raw = self.decision_function(X)
+        if raw.shape[1] == 1:
+            # Binary log-loss: one raw score column for the positive class
+            positive = 1.0 / (1.0 + np.exp(-raw[:, 0]))
+            return np.column_stack([1.0 - positive, positive])
+
+        raw = raw - raw.max(axis=1, keepdims=True)
+        proba = np.exp(raw)
+        return proba / proba.sum(axis=1, keepdims=True)
+
+    def predict(self, X):
+        raw = self.decision_function(X)
+        if raw.shape[1] == 1:
+            return self.classes_[(raw[:, 0] > 0).astype(int)]
+        return self.classes_[raw.argmax(axis=1)]
+
+
+def compile_model(model):
+    """Compile a fitted GradientBoostingClassifier into a CompiledEnsemble."""
+    return CompiledEnsemble.from_sklearn(model)
@@ -0,0 +1,34 @@
+import argparse
+import glob
+import os
+import time
+
+from .datasets import COLUMNAR_DIR, DATASET_DIR, columnar_path, convert_dataset
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Konversi dataset CSV ke format kolumnar (Feather)."
+    )
+    parser.add_argument("paths", nargs="*", help="file CSV (default: dataset/*.csv)")
+    parser.add_argument("--out", default=COLUMNAR_DIR)
+    parser.add_argument(
+        "--force", action="store_true", help="konversi ulang file yang masih sesuai"
+    )
+    args = parser.parse_args(argv)
+
+    paths = args.paths or sorted(glob.glob(os.path.join(DATASET_DIR, "*.csv")))
+    for path in paths:
+        if not args.force and columnar_path(path, args.out) is not None:
+            print(f"{path}: salinan kolumnar masih sesuai")
+            continue
+        start = time.perf_counter()
+        entry = convert_dataset(path, args.out)
+        print(
+            f"{path} -> {os.path.join(args.out, entry['file'])} "
+            f"({entry['rows']} baris, {time.perf_counter() - start:.2f} s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""Typed columnar copies of the CSV files in dataset/.
+
+Each CSV is converted once into an uncompressed Feather (Arrow IPC) file under
+dataset/columnar/, with dates already parsed. manifest.json records the schema
+and a fingerprint of the source CSV. load_dataset() reads the columnar copy
+while it matches its CSV and falls back to parsing the CSV otherwise.
+
+resolve_data_source() finds a dataset by name without blocking on the
+network: bundled file first, then an on-disk cache of the upstream copy that is
+revalidated with ETags in a background thread.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - pyarrow is optional at runtime
+    feather = None
+
+DATASET_DIR = "./dataset"
+COLUMNAR_DIR = "./dataset/columnar"
+MANIFEST_NAME = "manifest.json"
+
+# Columns parsed as timestamps when present
+DATE_COLUMNS = ["datetime"]
+
+_MANIFEST_LOCK = threading.Lock()
+
+
+# Also fingerprints model artifacts in utils.model
+def _file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _manifest_path(columnar_dir):
+    return os.path.join(columnar_dir, MANIFEST_NAME)
+
+
+def read_manifest(columnar_dir=COLUMNAR_DIR):
+    path = _manifest_path(columnar_dir)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_manifest(manifest, columnar_dir):
+    tmp_path = _manifest_path(columnar_dir) + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, _manifest_path(columnar_dir))
+
+
+def read_csv_typed(csv_path, **kwargs):
+    """Parse a CSV the way the columnar copy stores it (dates parsed)."""
+    header = pd.read_csv(csv_path, nrows=0).columns
+    parse_dates = [column for column in DATE_COLUMNS if column in header]
+    return pd.read_csv(csv_path, parse_dates=parse_dates, **kwargs)
+
+
+def convert_dataset(csv_path, columnar_dir=COLUMNAR_DIR):
+    """Write the columnar copy of one CSV and record it in the manifest."""
+    if feather is None:
+        raise ImportError("pyarrow diperlukan untuk membuat dataset kolumnar.")
+
+    os.makedirs(columnar_dir, exist_ok=True)
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    df = read_csv_typed(csv_path)
+
+    feather_name = f"{name}.feather"
+    tmp_path = os.path.join(columnar_dir, feather_name + ".tmp")
+    # Uncompressed: reads skip decompression and parsing entirely
+    feather.write_feather(df, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, os.path.join(columnar_dir, feather_name))
+
+    stat = os.stat(csv_path)
+    entry = {
+        "source": os.path.relpath(csv_path, columnar_dir),
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "source_sha256": _file_sha256(csv_path),
+        "file": feather_name,
+        "rows": len(df),
+        "schema": {column: str(dtype) for column, dtype in df.dtypes.items()},
+        "converted_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+    with _MANIFEST_LOCK:
+        manifest = read_manifest(columnar_dir)
+        manifest[name] = entry
+        _write_manifest(manifest, columnar_dir)
+
+    return entry
+
+
+def convert_all(dataset_dir=DATASET_DIR, columnar_dir=COLUMNAR_DIR):
+    """Convert every CSV directly under dataset_dir."""
+    return {
+        path: convert_dataset(path, columnar_dir)
+        for path in sorted(glob.glob(os.path.join(dataset_dir, "*.csv")))
+    }
+
+
+def columnar_path(csv_path, columnar_dir=COLUMNAR_DIR):
+    """Path of an up-to-date columnar copy of csv_path, or None."""
+    if feather is None:
+        return None
+
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    entry = read_manifest(columnar_dir).get(name)
+    if entry is None:
+        return None
+
+    path = os.path.join(columnar_dir, entry["file"])
+    if not os.path.exists(path):
+        return None
+
+    # Cheap check first; hash only when the CSV was touched (e.g. fresh checkout)
+    stat = os.stat(csv_path)
+    if stat.st_size != entry["source_size"]:
+        return None
+    if stat.st_mtime_ns != entry["source_mtime_ns"]:
+        if _file_sha256(csv_path) != entry["source_sha256"]:
+            return None
+        # Same content: record the new mtime so later loads skip the hash
+        with _MANIFEST_LOCK:
+            manifest = read_manifest(columnar_dir)
+            if manifest.get(name, {}).get("source_sha256") == entry["source_sha256"]:
+                manifest[name]["source_mtime_ns"] = stat.st_mtime_ns
+                _write_manifest(manifest, columnar_dir)
+    return path
+
+
+def load_dataset(csv_path, columnar_dir=COLUMNAR_DIR):
+    """Load a dataset, preferring its columnar copy over parsing the CSV."""
+    path = columnar_path(csv_path, columnar_dir)
+    if path is None:
+        return read_csv_typed(csv_path)
+
+    # Building the DataFrame copies the columns anyway, so no memory map
+    return feather.read_feather(path)
+
+
+# Upstream copies of the bundled datasets, used only when no local file exists.
+# Each file keeps the branch the app has always read it from.
+REMOTE_DATASETS = {
+    "dummy_data_test.csv": "https://raw.githubusercontent.com/Vinzzztty/Forecasting-Hidroponik/main/dataset/dummy_data_test.csv",
+    "dataset_model_kualitas.csv": "https://raw.githubusercontent.com/Vinzzztty/Forecasting-Hidroponik/refs/heads/V2/dataset/dataset_model_kualitas.csv",
+}
+# Directory of downloaded copies (not HYDROSIM_CACHE_DIR, which is the
+# forecast cache's own directory and turns its disk tier off when empty)
+REMOTE_CACHE_DIR = os.environ.get("HYDROSIM_DATASET_CACHE_DIR") or "./.cache/datasets"
+# A cached remote copy is revalidated (ETag) at most this often
+REVALIDATE_SECONDS = 6 * 3600
+REMOTE_TIMEOUT = 10
+
+_REFRESH_LOCK = threading.Lock()
+_REFRESHING = set()
+
+
+def _remote_meta_path(name, cache_dir):
+    return os.path.join(cache_dir, f"{name}.json")
+
+
+def _read_remote_meta(name, cache_dir):
+    path = _remote_meta_path(name, cache_dir)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def fetch_remote_dataset(name, cache_dir=REMOTE_CACHE_DIR):
+    """Download (or revalidate with If-None-Match) the remote copy of a dataset.
+
+    Returns the cached path, or None when there is no cached copy and the
+    download failed. Network errors keep the existing cached copy.
+    """
+    import requests
+
+    url = REMOTE_DATASETS[name]
+    path = os.path.join(cache_dir, name)
+    meta = _read_remote_meta(name, cache_dir)
+
+    headers = {}
+    # A copy downloaded from another URL is fetched again, not revalidated
+    if os.path.exists(path) and meta.get("url") == url:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        response = requests.get(url, headers=headers, timeout=REMOTE_TIMEOUT)
+        if response.status_code != 304:
+            response.raise_for_status()
+    except requests.RequestException:
+        return path if os.path.exists(path) else None
+
+    os.makedirs(cache_dir, exist_ok=True)
+    if response.status_code != 304:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(response.content)
+        os.replace(tmp_path, path)
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+
+    meta["checked_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    tmp_meta = _remote_meta_path(name, cache_dir) + ".tmp"
+    with open(tmp_meta, "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_meta, _remote_meta_path(name, cache_dir))
+
+    return path
+
+
+def _refresh_in_background(name, cache_dir):
+    # At most one download/revalidation per dataset at a time
+    with _REFRESH_LOCK:
+        if name in _REFRESHING:
+            return
+        _REFRESHING.add(name)
+
+    def refresh():
+        try:
+            fetch_remote_dataset(name, cache_dir)
+        finally:
+            with _REFRESH_LOCK:
+                _REFRESHING.discard(name)
+
+    threading.Thread(target=refresh, name=f"refresh-{name}", daemon=True).start()
+
+
+def _is_stale(name, cache_dir):
+    checked_at = _read_remote_meta(name, cache_dir).get("checked_at")
+    if checked_at is None:
+        return True
+    age = datetime.now(timezone.utc) - datetime.fromisoformat(checked_at)
+    return age.total_seconds() > REVALIDATE_SECONDS
+
+
+def resolve_data_source(
+    name, dataset_dir=DATASET_DIR, cache_dir=REMOTE_CACHE_DIR, wait=False
+):
+    """Local path of a dataset, without waiting on the network.
+
+    Order: an existing path as given, the bundled file in dataset/, then the
+    on-disk cache of the remote copy (revalidated in a background thread once
+    it is older than REVALIDATE_SECONDS). When no local copy exists the
+    download starts in the background and None is returned, unless wait=True
+    (offline CLIs), which downloads in the foreground.
+    """
+    if os.path.exists(name):
+        return name
+
+    name = os.path.basename(name)
+    bundled = os.path.join(dataset_dir, name)
+    if os.path.exists(bundled):
+        return bundled
+
+    if name not in REMOTE_DATASETS:
+        raise FileNotFoundError(f"Dataset {name} tidak ditemukan.")
+
+    cached = os.path.join(cache_dir, name)
+    if os.path.exists(cached):
+        if _is_stale(name, cache_dir):
+            _refresh_in_background(name, cache_dir)
+        return cached
+
+    if wait:
+        return fetch_remote_dataset(name, cache_dir)
+
+    _refresh_in_background(name, cache_dir)
+    return None
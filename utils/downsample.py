@@ -0,0 +1,96 @@
+import numpy as np
+
+# Traces longer than this are reduced before they are sent to the browser.
+# Roughly the pixel width of a wide chart; set to None to disable downsampling.
+DOWNSAMPLE_THRESHOLD = 2000
+
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: indices of n_out visually representative points."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # First and last points are always kept; the rest is split into buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    # Average of each bucket, used as the third triangle vertex
+    starts, ends = edges[:-1], edges[1:]
+    sums_x = np.add.reduceat(x[1 : n - 1], starts - 1)
+    sums_y = np.add.reduceat(y[1 : n - 1], starts - 1)
+    sizes = np.diff(np.append(starts, n - 1))
+    avg_x = np.append(sums_x / sizes, x[-1])
+    avg_y = np.append(sums_y / sizes, y[-1])
+
+    previous = 0
+    for bucket, (start, end) in enumerate(zip(starts, ends)):
+        bx, by = x[start:end], y[start:end]
+        area = np.abs(
+            (x[previous] - avg_x[bucket + 1]) * (by - y[previous])
+            - (x[previous] - bx) * (avg_y[bucket + 1] - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        indices[bucket + 1] = previous
+
+    return indices
+
+
+def minmax_indices(y, n_out):
+    """Min and max of each bucket (in original order): keeps every peak."""
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    n_buckets = n_out // 2
+    if n_out >= n or n_buckets < 1:
+        return np.arange(n)
+
+    # Pad to a whole number of buckets so the reduction is one reshape
+    size = -(-n // n_buckets)
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(n_buckets, size)
+    valid = ~np.isnan(buckets).all(axis=1)
+    offsets = np.arange(n_buckets)[valid] * size
+
+    buckets = buckets[valid]
+    lows = offsets + np.nanargmin(buckets, axis=1)
+    highs = offsets + np.nanargmax(buckets, axis=1)
+    return np.unique(np.concatenate([lows, highs, [0, n - 1]]))
+
+
+def downsample_indices(x, y, n_out=None, method="lttb", threshold=None):
+    """Indices to keep so a trace stays under the threshold (all of them if it already is)."""
+    threshold = DOWNSAMPLE_THRESHOLD if threshold is None else threshold
+    x = np.asarray(x)
+    if not threshold or len(x) <= threshold:
+        return np.arange(len(x))
+
+    n_out = n_out or threshold
+    if method == "lttb":
+        # LTTB needs numeric x; datetimes are compared as int64 nanoseconds
+        if x.dtype.kind == "M":
+            x = x.astype("datetime64[ns]").astype(np.int64)
+        return lttb_indices(x, y, n_out)
+    if method == "minmax":
+        return minmax_indices(y, n_out)
+    raise ValueError(f"Unknown downsampling method: {method!r}")
+
+
+def downsample_xy(x, y, n_out=None, method="lttb", threshold=None):
+    """Downsampled (x, y) arrays of a single trace."""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    keep = downsample_indices(x, y, n_out, method, threshold)
+    return x[keep], y[keep]
+
+
+def downsample_frame(df, x, y, n_out=None, method="lttb", threshold=None):
+    """Rows of df to plot, chosen from its x and y columns."""
+    keep = downsample_indices(df[x], df[y], n_out, method, threshold)
+    if len(keep) == len(df):
+        return df
+    return df.iloc[keep]
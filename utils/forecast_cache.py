@@ -0,0 +1,137 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# Default on-disk tier; set HYDROSIM_CACHE_DIR="" to keep the cache in memory only
+DEFAULT_CACHE_DIR = os.environ.get("HYDROSIM_CACHE_DIR", "./.cache/forecasts")
+DEFAULT_MAX_ENTRIES = 64
+DEFAULT_MAX_DISK_BYTES = 256 * 1024 * 1024
+
+
+def normalize_frame(df):
+    """Canonical form of a frame for hashing: sorted columns, float64 values."""
+    # Row order is kept: the future frame copies regressors from the last row
+    df = df[sorted(df.columns)].reset_index(drop=True)
+    numeric = df.select_dtypes("number").columns
+    return df.astype({col: "float64" for col in numeric})
+
+
+def forecast_cache_key(df_prophet, model_sha256, periods):
+    """Content address of a forecast: normalized input, model and horizon."""
+    frame = normalize_frame(df_prophet)
+    digest = hashlib.sha256()
+    digest.update("|".join(frame.columns).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    digest.update(f"|{model_sha256}|{periods}".encode())
+    return digest.hexdigest()
+
+
+class ForecastCache:
+    """Two-tier forecast cache: in-memory LRU in front of Parquet files on disk."""
+
+    def __init__(
+        self,
+        max_entries=DEFAULT_MAX_ENTRIES,
+        cache_dir=DEFAULT_CACHE_DIR,
+        max_disk_bytes=DEFAULT_MAX_DISK_BYTES,
+    ):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir or None
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.parquet")
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return self._memory[key]
+
+        if self.cache_dir and os.path.exists(self._path(key)):
+            try:
+                frame = pd.read_parquet(self._path(key))
+            except (OSError, ValueError):
+                # Truncated or unreadable file: treat as a miss
+                frame = None
+            if frame is not None:
+                # Refresh mtime so disk eviction stays least-recently-used
+                os.utime(self._path(key))
+                self._remember(key, frame)
+                with self._lock:
+                    self.stats["disk_hits"] += 1
+                return frame
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def put(self, key, frame):
+        self._remember(key, frame)
+
+        if self.cache_dir:
+            # Write then rename, so readers never see a half-written file
+            tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            frame.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, self._path(key))
+            self._evict_disk()
+
+    def _remember(self, key, frame):
+        with self._lock:
+            self._memory[key] = frame
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".parquet"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if self.cache_dir:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".parquet"):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_forecast_cache():
+    """Return the process-wide forecast cache."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ForecastCache()
+        return _default_cache
@@ -0,0 +1,104 @@
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .forecast_cache import forecast_cache_key, get_forecast_cache
+from .model import (
+    LEAF_CAP,
+    MAX_DAY,
+    PROPHET_MODEL_PATH,
+    create_future_dataframe,
+    load_model,
+    make_predictions,
+    model_fingerprint,
+    prophet_config,
+    prophet_from_config,
+    resolve_model_path,
+)
+
+# A hole needs at least this many readings to get its own Prophet fit
+MIN_ROWS_PER_HOLE = 10
+
+
+def _fit_predict_hole(hole, df_hole, config, periods):
+    # Runs in a worker process: fit this hole's series and forecast it
+    logging.getLogger("cmdstanpy").setLevel(logging.WARNING)
+
+    hole_model = prophet_from_config(config)
+
+    train = df_hole.copy()
+    train["cap"] = LEAF_CAP
+    hole_model.fit(train)
+
+    future = create_future_dataframe(df_hole, periods=periods)
+    future["cap"] = LEAF_CAP
+    forecast = make_predictions(hole_model, future)
+    forecast.insert(0, "hole", hole)
+    return forecast
+
+
+def forecast_per_hole(
+    df_prophet,
+    periods=MAX_DAY,
+    model_path=PROPHET_MODEL_PATH,
+    max_workers=None,
+    uncertainty_samples=None,
+):
+    """Fit and forecast every hole's LeafCount series separately, in parallel."""
+    model_path = resolve_model_path(model_path)
+    # 'hole' is constant inside one hole's series, so it is not a regressor here
+    config = prophet_config(load_model(model_path), exclude_regressors=("hole",))
+    if uncertainty_samples is not None:
+        config["params"]["uncertainty_samples"] = uncertainty_samples
+
+    cache = get_forecast_cache()
+    key = forecast_cache_key(
+        df_prophet,
+        model_fingerprint(model_path)[2],
+        f"per-hole:{periods}:{config['params']['uncertainty_samples']}",
+    )
+    combined = cache.get(key)
+    if combined is not None:
+        return combined
+
+    holes = [
+        (hole, df_hole.sort_values("ds"))
+        for hole, df_hole in df_prophet.groupby("hole", sort=True)
+        if len(df_hole) >= MIN_ROWS_PER_HOLE
+    ]
+    if not holes:
+        raise ValueError(
+            f"Tidak ada lubang (hole) dengan minimal {MIN_ROWS_PER_HOLE} data."
+        )
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(holes))
+    if max_workers == 1:
+        forecasts = [
+            _fit_predict_hole(hole, df_hole, config, periods) for hole, df_hole in holes
+        ]
+    else:
+        # spawn: forking the multi-threaded Streamlit server is not safe
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            futures = [
+                executor.submit(_fit_predict_hole, hole, df_hole, config, periods)
+                for hole, df_hole in holes
+            ]
+            forecasts = [future.result() for future in futures]
+
+    combined = pd.concat(forecasts, ignore_index=True)
+    cache.put(key, combined)
+    return combined
+
+
+def aggregate_hole_forecasts(per_hole, statistics=("mean", "min", "max")):
+    """Per-day aggregate of the per-hole yhat (one column per statistic)."""
+    per_hole = per_hole.assign(date=per_hole["ds"].dt.normalize())
+    aggregate = per_hole.groupby("date")["yhat"].agg(list(statistics))
+    aggregate["holes"] = per_hole.groupby("date")["hole"].nunique()
+    return aggregate.reset_index().rename(columns={"date": "ds"})
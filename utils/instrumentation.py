@@ -0,0 +1,97 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("hydrosim.timing")
+
+# Level of the timing log on stderr, e.g. INFO (default), WARNING, or OFF
+TIMING_LOG_LEVEL = os.environ.get("HYDROSIM_TIMING_LOG", "INFO").upper()
+
+
+def configure_timing_log(level=TIMING_LOG_LEVEL, stream=None):
+    """Print timing records to stream (stderr) at level; OFF drops them."""
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    if level == "OFF":
+        logger.disabled = True
+        return logger
+
+    handler = logging.StreamHandler(stream if stream is not None else sys.stderr)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.disabled = False
+    # Its own handler already prints the records; don't repeat them via root
+    logger.propagate = False
+    return logger
+
+
+configure_timing_log()
+
+_TIMING_HOOKS = []
+_TIMING_HOOKS_LOCK = threading.Lock()
+
+
+def register_timing_hook(hook):
+    """Call hook(record) for every emitted timing record (e.g. to push metrics)."""
+    with _TIMING_HOOKS_LOCK:
+        _TIMING_HOOKS.append(hook)
+    return hook
+
+
+def unregister_timing_hook(hook):
+    with _TIMING_HOOKS_LOCK:
+        _TIMING_HOOKS.remove(hook)
+
+
+class StageTimer:
+    """Accumulate wall-clock time per named stage of one request."""
+
+    def __init__(self, event):
+        self.event = event
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+    @property
+    def total(self):
+        return sum(self.stages.values())
+
+    def summary(self):
+        parts = [
+            f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.stages.items()
+        ]
+        return " · ".join(parts) + f" · total {self.total * 1000:.0f} ms"
+
+    def emit(self, **fields):
+        """Log the timings as one JSON line and pass them to every registered hook."""
+        record = {
+            "event": self.event,
+            "stages_ms": {
+                name: round(seconds * 1000, 3) for name, seconds in self.stages.items()
+            },
+            "total_ms": round(self.total * 1000, 3),
+            **fields,
+        }
+        logger.info(json.dumps(record, default=str))
+
+        with _TIMING_HOOKS_LOCK:
+            hooks = list(_TIMING_HOOKS)
+        for hook in hooks:
+            try:
+                hook(record)
+            except Exception:
+                logger.exception("Timing hook %r failed", hook)
+
+        return record
@@ -0,0 +1,145 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
+
+# Worker threads shared by every session of the app process
+JOB_MAX_WORKERS = int(os.environ.get("HYDROSIM_JOB_WORKERS", "2"))
+# Jobs waiting for a worker before submit() refuses new work
+JOB_MAX_PENDING = 32
+# Finished jobs kept so later reruns and other sessions can pick up the result
+JOB_MAX_FINISHED = 64
+
+
+class Job:
+    """One unit of background work, identified by its key."""
+
+    def __init__(self, key, future):
+        self.key = key
+        self.future = future
+        self.submitted_at = time.monotonic()
+        self.started_at = None
+        self.finished_at = None
+        # Free-form details for the caller, e.g. a StageTimer of the work
+        self.meta = {}
+
+    @property
+    def status(self):
+        if self.future.cancelled():
+            return "cancelled"
+        if not self.future.done():
+            return "running" if self.started_at is not None else "pending"
+        return "failed" if self.future.exception() is not None else "done"
+
+    def done(self):
+        return self.future.done()
+
+    def wait(self, timeout=None):
+        """Block up to timeout seconds; True when the job has finished."""
+        done, _ = wait_futures([self.future], timeout=timeout)
+        return bool(done)
+
+    def result(self, timeout=None):
+        return self.future.result(timeout=timeout)
+
+    @property
+    def elapsed(self):
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.submitted_at
+
+
+class JobQueue:
+    """Bounded thread pool whose jobs are coalesced by key.
+
+    Submitting a key that is already pending, running or finished successfully
+    returns the existing Job instead of starting the work again, so a widget
+    change (which restarts the Streamlit script) or a second session asking for
+    the same forecast shares one computation. Failed jobs are retried on the
+    next submit.
+    """
+
+    def __init__(
+        self,
+        max_workers=JOB_MAX_WORKERS,
+        max_pending=JOB_MAX_PENDING,
+        max_finished=JOB_MAX_FINISHED,
+    ):
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="hydrosim-job"
+        )
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "coalesced": 0, "completed": 0, "failed": 0}
+
+    def _run(self, job, fn, args, kwargs):
+        job.started_at = time.monotonic()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            job.finished_at = time.monotonic()
+
+    def _on_done(self, job):
+        with self._lock:
+            failed = job.future.cancelled() or job.future.exception() is not None
+            self._stats["failed" if failed else "completed"] += 1
+            self._evict()
+
+    def _evict(self):
+        # Oldest finished jobs go first; unfinished jobs are never dropped
+        finished = [key for key, job in self._jobs.items() if job.done()]
+        for key in finished[: max(0, len(finished) - self.max_finished)]:
+            del self._jobs[key]
+
+    def submit(self, key, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) in the background under key, or join it."""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.status in ("pending", "running", "done"):
+                self._jobs.move_to_end(key)
+                self._stats["coalesced"] += 1
+                return job
+
+            pending = sum(1 for j in self._jobs.values() if j.status == "pending")
+            if pending >= self.max_pending:
+                raise RuntimeError(
+                    "Antrian pekerjaan sedang penuh, coba lagi beberapa saat lagi."
+                )
+
+            # The Job exists before its future so _run can stamp started_at
+            job = Job(key, None)
+            job.future = self._executor.submit(self._run, job, fn, args, kwargs)
+            self._jobs[key] = job
+            self._stats["submitted"] += 1
+
+        job.future.add_done_callback(lambda _: self._on_done(job))
+        return job
+
+    def get(self, key):
+        with self._lock:
+            return self._jobs.get(key)
+
+    def stats(self):
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return {**self._stats, "jobs": counts}
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_default_queue = None
+_default_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    """Return the process-wide job queue."""
+    global _default_queue
+    with _default_queue_lock:
+        if _default_queue is None:
+            _default_queue = JobQueue()
+        return _default_queue
@@ -1,11 +1,37 @@
 from prophet import Prophet
+import numpy as np
 import pandas as pd
 import joblib
+import sklearn
+import abc
+import copy
+import hashlib
+import importlib.util
+import json
+import os
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from datetime import datetime, timezone
 from sklearn.ensemble import GradientBoostingClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
 import streamlit as st
 
+from .assets import asset_url
+from .compiled_model import CompiledEnsemble, compile_model
+from .datasets import _file_sha256, load_dataset, resolve_data_source
+from .forecast_cache import forecast_cache_key, get_forecast_cache
+from .instrumentation import StageTimer
+from .jobs import get_job_queue
+
+PROPHET_MODEL_PATH = "./model/prophet_model.pkl"
+
+# Longest horizon the Forecasting page offers and the logistic growth ceiling
+MAX_DAY = 40
+LEAF_CAP = 18
+
 
 def prepare_data(df):
     df_prophet = df[
@@ -30,12 +56,90 @@ def prepare_data(df):
     return df_prophet
 
 
+# Process-wide model registry, shared by every Streamlit session.
+# Each entry is keyed by the absolute path and stores the file fingerprint the
+# model was loaded from, so a retrained pickle is picked up without a restart.
+_MODEL_REGISTRY = {}
+_MODEL_REGISTRY_LOCK = threading.Lock()
+_MODEL_STATS = {"hits": 0, "misses": 0, "reloads": 0, "load_seconds": 0.0}
+
+
+def model_fingerprint(model_path):
+    """Return (mtime_ns, size, sha256) of the file backing a model."""
+    path = os.path.abspath(model_path)
+    stat = os.stat(path)
+
+    # Only hash the file again when its mtime or size changed
+    entry = _MODEL_REGISTRY.get(path)
+    if entry is not None and entry["stat"] == (stat.st_mtime_ns, stat.st_size):
+        return entry["fingerprint"]
+    return (stat.st_mtime_ns, stat.st_size, _file_sha256(path))
+
+
 def load_model(model_path):
-    model_loaded = joblib.load(model_path)
+    """Load a pickled model once per process and reuse it until the file changes."""
+    path = os.path.abspath(model_path)
+
+    with _MODEL_REGISTRY_LOCK:
+        stat = os.stat(path)
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+        entry = _MODEL_REGISTRY.get(path)
+
+        if entry is not None and entry["stat"] == stat_key:
+            _MODEL_STATS["hits"] += 1
+            return entry["model"]
+
+        # mtime/size changed (or first load): compare content before unpickling
+        sha256 = _file_sha256(path)
+        if entry is not None and entry["fingerprint"][2] == sha256:
+            entry["stat"] = stat_key
+            entry["fingerprint"] = stat_key + (sha256,)
+            _MODEL_STATS["hits"] += 1
+            return entry["model"]
+
+        start = time.perf_counter()
+        if path.endswith(".npz"):
+            model_loaded = CompiledEnsemble.load(path)
+        else:
+            model_loaded = joblib.load(path)
+        elapsed = time.perf_counter() - start
+
+        _MODEL_STATS["misses"] += 1
+        _MODEL_STATS["load_seconds"] += elapsed
+        if entry is not None:
+            _MODEL_STATS["reloads"] += 1
+
+        _MODEL_REGISTRY[path] = {
+            "model": model_loaded,
+            "stat": stat_key,
+            "fingerprint": stat_key + (sha256,),
+            "load_seconds": elapsed,
+        }
 
     return model_loaded
 
 
+def model_cache_stats():
+    """Return hit/miss counters and load timings of the model registry."""
+    with _MODEL_REGISTRY_LOCK:
+        stats = dict(_MODEL_STATS)
+        stats["models"] = {
+            path: {
+                "sha256": entry["fingerprint"][2],
+                "load_seconds": entry["load_seconds"],
+            }
+            for path, entry in _MODEL_REGISTRY.items()
+        }
+    return stats
+
+
+def clear_model_cache():
+    """Drop every cached model and reset the counters."""
+    with _MODEL_REGISTRY_LOCK:
+        _MODEL_REGISTRY.clear()
+        _MODEL_STATS.update(hits=0, misses=0, reloads=0, load_seconds=0.0)
+
+
 def create_future_dataframe(df_test, periods):
     future_dates = pd.date_range(start=df_test["ds"].max(), periods=periods, freq="D")
     last_row = df_test.iloc[-1]
@@ -55,84 +159,904 @@ def create_future_dataframe(df_test, periods):
     return future
 
 
-def make_predictions(model, future):
-    forecast = model.predict(future)
-    forecast[["yhat", "yhat_lower", "yhat_upper"]] = forecast[
-        ["yhat", "yhat_lower", "yhat_upper"]
-    ].clip(lower=0)
+# Samples for interval estimates in interactive views (the model default is 1000)
+INTERACTIVE_UNCERTAINTY_SAMPLES = 200
+
+
+def predict_point(model, future):
+    """Deterministic yhat (trend + seasonality + regressors), no uncertainty sampling."""
+    df = model.setup_dataframe(future.copy())
+    trend = model.predict_trend(df)
+
+    # Same algebra as Prophet.predict_seasonal_components, for the summed terms only
+    features, _, component_cols, _ = model.make_all_seasonality_features(df)
+    beta = np.mean(model.params["beta"], axis=0)
+    X = features.to_numpy()
+    additive = X @ (beta * component_cols["additive_terms"].to_numpy()) * model.y_scale
+    multiplicative = X @ (beta * component_cols["multiplicative_terms"].to_numpy())
+
+    return pd.DataFrame(
+        {
+            "ds": df["ds"],
+            "trend": trend,
+            "yhat": trend * (1 + multiplicative) + additive,
+        }
+    )
+
+
+def make_predictions(model, future, mode="full", uncertainty_samples=None):
+    # mode="full": Prophet predict with intervals (uncertainty_samples overrides
+    #   the number of draws, e.g. INTERACTIVE_UNCERTAINTY_SAMPLES for a faster,
+    #   noisier estimate).
+    # mode="point": yhat only, computed directly without sampling.
+    if mode == "point":
+        forecast = predict_point(model, future)
+    elif mode == "full":
+        if uncertainty_samples is not None:
+            # Shallow copy: the shared cached model keeps its own setting
+            model = copy.copy(model)
+            model.uncertainty_samples = uncertainty_samples
+        forecast = model.predict(future)
+    else:
+        raise ValueError(f"Unknown prediction mode: {mode!r}")
+
+    # Interval columns are absent when the model skips uncertainty sampling
+    columns = [
+        column
+        for column in ["yhat", "yhat_lower", "yhat_upper"]
+        if column in forecast.columns
+    ]
+    forecast[columns] = forecast[columns].clip(lower=0)
     return forecast
 
 
-def quality_model():
-    # Load the dataset
-    url = "https://raw.githubusercontent.com/Vinzzztty/Forecasting-Hidroponik/refs/heads/V2/dataset/dataset_model_kualitas.csv"
-    data = pd.read_csv(url)
+# Forecasting backends, selected by name per request. Prophet uses the pickled
+# model; ARIMA and the logistic growth curve are fitted on the log being
+# forecast, which takes milliseconds instead of a Prophet predict.
+ARIMA_ORDER = (1, 1, 1)
+# Fewest days of readings ARIMA is fitted on
+ARIMA_MIN_DAYS = 5
+# Interval columns cover about 95% of the residual spread
+INTERVAL_Z = 1.96
+# Gauss-Newton refinements of the logistic fit (it usually converges in < 10)
+LOGISTIC_FIT_ITERATIONS = 20
 
-    # Define feature columns and target column
-    feature_columns = [
-        "temperature",
-        "humidity",
-        "light",
-        "pH",
-        "EC",
-        "TDS",
-        "WaterTemp",
+
+def _forecast_frame(ds, yhat, yhat_lower, yhat_upper):
+    # Same columns and clipping as make_predictions
+    forecast = pd.DataFrame(
+        {
+            "ds": np.asarray(ds),
+            "yhat": yhat,
+            "yhat_lower": yhat_lower,
+            "yhat_upper": yhat_upper,
+        }
+    )
+    columns = ["yhat", "yhat_lower", "yhat_upper"]
+    forecast[columns] = forecast[columns].clip(lower=0)
+    return forecast
+
+
+def daily_leaf_series(df_prophet):
+    """Mean LeafCount per calendar day, gaps filled by linear interpolation."""
+    series = df_prophet.set_index("ds")["y"].sort_index()
+    return series.resample("D").mean().interpolate()
+
+
+def fit_logistic_growth(t, y, cap=LEAF_CAP, iterations=LOGISTIC_FIT_ITERATIONS):
+    """Fit y = cap / (1 + exp(-(a + b * t))) and return (a, b).
+
+    With the ceiling fixed the curve is a straight line in logit space,
+    log(y / (cap - y)) = a + b * t, which gives a closed-form weighted least
+    squares start; the weights (y * (cap - y) / cap) ** 2 undo the stretching
+    of the logit near 0 and near the cap. A few Gauss-Newton steps then
+    minimize the squared error in leaf counts, so the curve follows the mean
+    LeafCount rather than the mean logit. Every step is vectorized over all
+    readings.
+    """
+    t = np.asarray(t, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # Readings at 0 or at the cap have an infinite logit
+    clipped = np.clip(y, 0.5, cap - 0.5)
+    z = np.log(clipped / (cap - clipped))
+    w = (clipped * (cap - clipped) / cap) ** 2
+
+    t_mean = np.average(t, weights=w)
+    z_mean = np.average(z, weights=w)
+    spread = np.sum(w * (t - t_mean) ** 2)
+    if spread == 0:
+        raise ValueError("Data harus mencakup lebih dari satu waktu pengamatan.")
+
+    b = np.sum(w * (t - t_mean) * (z - z_mean)) / spread
+    a = z_mean - b * t_mean
+
+    for _ in range(iterations):
+        p = 1.0 / (1.0 + np.exp(-(a + b * t)))
+        slope = cap * p * (1.0 - p)
+        jacobian = np.column_stack([slope, slope * t])
+        step, *_ = np.linalg.lstsq(jacobian, y - cap * p, rcond=None)
+        if not np.all(np.isfinite(step)):
+            break
+        a, b = a + step[0], b + step[1]
+        if np.abs(step).max() < 1e-8:
+            break
+
+    return a, b
+
+
+def logistic_growth(t, a, b, cap=LEAF_CAP):
+    return cap / (1.0 + np.exp(-(a + b * np.asarray(t, dtype=float))))
+
+
+class Forecaster(abc.ABC):
+    """A forecasting backend for forecast_full_horizon.
+
+    predict(df_prophet, future) returns ds, yhat, yhat_lower and yhat_upper
+    for every row of `future` (see create_future_dataframe).
+    """
+
+    name = None
+
+    def cache_identity(self):
+        """(model id, settings) that go into forecast cache and job keys."""
+        return self.name, ""
+
+    def load(self):
+        """Load anything predict needs; a no-op for backends fitted per request."""
+
+    def fit(self, df_prophet):
+        """Train on df_prophet alone for a backtest; a no-op by default."""
+
+    @abc.abstractmethod
+    def predict(self, df_prophet, future):
+        """Forecast `future` from the readings in df_prophet."""
+
+
+class ProphetForecaster(Forecaster):
+    """The pickled Prophet model, with the regressors of the last reading."""
+
+    name = "prophet"
+
+    def __init__(
+        self, model_path=PROPHET_MODEL_PATH, mode="full", uncertainty_samples=None
+    ):
+        self.model_path = resolve_model_path(model_path)
+        self.mode = mode
+        self.uncertainty_samples = uncertainty_samples
+        self.model = None
+
+    def cache_identity(self):
+        # Same key as before backends were selectable, so cached forecasts stay valid
+        return (
+            model_fingerprint(self.model_path)[2],
+            f"{self.mode}:{self.uncertainty_samples}",
+        )
+
+    def load(self):
+        self.model = load_model(self.model_path)
+
+    def fit(self, df_prophet):
+        # Same hyperparameters and regressors as the pickled model, new history
+        if self.model is None:
+            self.load()
+        train = df_prophet.copy()
+        train["cap"] = LEAF_CAP
+        config = prophet_config(self.model)
+        if self.uncertainty_samples is not None:
+            config["params"]["uncertainty_samples"] = self.uncertainty_samples
+        self.model = prophet_from_config(config)
+        self.model.fit(train)
+
+    def predict(self, df_prophet, future):
+        if self.model is None:
+            self.load()
+        return make_predictions(
+            self.model,
+            future,
+            mode=self.mode,
+            uncertainty_samples=self.uncertainty_samples,
+        )
+
+
+class LogisticForecaster(Forecaster):
+    """Logistic growth curve towards `cap` fitted on the readings themselves."""
+
+    name = "logistic"
+
+    def __init__(self, cap=LEAF_CAP):
+        self.cap = cap
+
+    def cache_identity(self):
+        return self.name, f"cap={self.cap}"
+
+    def predict(self, df_prophet, future):
+        origin = df_prophet["ds"].min()
+        t = (df_prophet["ds"] - origin) / pd.Timedelta(days=1)
+        a, b = fit_logistic_growth(t, df_prophet["y"], self.cap)
+
+        residual = df_prophet["y"].to_numpy() - logistic_growth(t, a, b, self.cap)
+        half_width = INTERVAL_Z * residual.std()
+
+        yhat = logistic_growth(
+            (future["ds"] - origin) / pd.Timedelta(days=1), a, b, self.cap
+        )
+        return _forecast_frame(future["ds"], yhat, yhat - half_width, yhat + half_width)
+
+
+class ArimaForecaster(Forecaster):
+    """ARIMA on the daily mean LeafCount; needs the optional statsmodels."""
+
+    name = "arima"
+
+    def __init__(self, order=ARIMA_ORDER):
+        self.order = tuple(order)
+
+    def cache_identity(self):
+        return self.name, f"order={self.order}"
+
+    def load(self):
+        # statsmodels is only imported when ARIMA is actually requested
+        try:
+            from statsmodels.tsa.arima.model import ARIMA  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "Backend ARIMA memerlukan statsmodels (`pip install statsmodels`)."
+            ) from e
+
+    def predict(self, df_prophet, future):
+        self.load()
+        from statsmodels.tsa.arima.model import ARIMA
+
+        series = daily_leaf_series(df_prophet)
+        if len(series) < ARIMA_MIN_DAYS:
+            raise ValueError(
+                f"ARIMA memerlukan data minimal {ARIMA_MIN_DAYS} hari "
+                f"(tersedia {len(series)} hari)."
+            )
+
+        # Convergence warnings are common on short, smooth series
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            fitted = ARIMA(series.to_numpy(), order=self.order).fit()
+
+        # The future frame starts on the last observed day, one row per day
+        start = len(series) - 1
+        frame = fitted.get_prediction(
+            start=start, end=start + len(future) - 1
+        ).summary_frame(alpha=0.05)
+        return _forecast_frame(
+            future["ds"],
+            frame["mean"].to_numpy(),
+            frame["mean_ci_lower"].to_numpy(),
+            frame["mean_ci_upper"].to_numpy(),
+        )
+
+
+FORECASTERS = {
+    ProphetForecaster.name: ProphetForecaster,
+    LogisticForecaster.name: LogisticForecaster,
+    ArimaForecaster.name: ArimaForecaster,
+}
+# Backends with an optional dependency, by the module they import
+_FORECASTER_REQUIREMENTS = {ArimaForecaster.name: "statsmodels"}
+
+
+def available_forecasters():
+    """Names of the backends whose dependencies are installed."""
+    return [
+        name
+        for name in FORECASTERS
+        if name not in _FORECASTER_REQUIREMENTS
+        or importlib.util.find_spec(_FORECASTER_REQUIREMENTS[name]) is not None
     ]
-    target_column = "Pattern"
+
+
+def get_forecaster(
+    backend="prophet",
+    model_path=PROPHET_MODEL_PATH,
+    mode="full",
+    uncertainty_samples=None,
+):
+    """Forecaster for a backend name; the other arguments only apply to Prophet."""
+    if backend not in FORECASTERS:
+        raise ValueError(
+            f"Backend forecast {backend!r} tidak dikenal, "
+            f"pilih salah satu dari {', '.join(FORECASTERS)}."
+        )
+    if backend == ProphetForecaster.name:
+        return ProphetForecaster(model_path, mode, uncertainty_samples)
+    return FORECASTERS[backend]()
+
+
+# Prediction latency per backend, for every forecast computed in this process
+_FORECASTER_STATS = {}
+_FORECASTER_STATS_LOCK = threading.Lock()
+
+
+def _record_forecaster_call(name, seconds, failed=False):
+    with _FORECASTER_STATS_LOCK:
+        stats = _FORECASTER_STATS.setdefault(
+            name, {"calls": 0, "failures": 0, "seconds": 0.0, "max_seconds": 0.0}
+        )
+        stats["calls"] += 1
+        stats["failures"] += int(failed)
+        stats["seconds"] += seconds
+        stats["max_seconds"] = max(stats["max_seconds"], seconds)
+
+
+def forecaster_stats():
+    """Calls, failures and prediction latency of every backend used so far."""
+    with _FORECASTER_STATS_LOCK:
+        return {
+            name: {**stats, "mean_ms": stats["seconds"] * 1000 / stats["calls"]}
+            for name, stats in _FORECASTER_STATS.items()
+        }
+
+
+def evaluate_forecasters(df_prophet, backends=None, holdout_days=7, **options):
+    """Backtest backends on the last holdout_days days of a log.
+
+    Each backend is fitted on the readings before the holdout window (Prophet
+    is refitted with the pickled model's settings) and scored against the
+    daily mean LeafCount inside it. Returns one row per backend with fit plus
+    prediction latency (ms), MAE, RMSE, MAPE (%, over days with leaves) and the
+    number of days scored; a backend that cannot run gets its error message
+    instead. `options` are passed to get_forecaster (e.g. mode for Prophet).
+    """
+    backends = list(FORECASTERS) if backends is None else backends
+    days = df_prophet["ds"].dt.normalize()
+    cutoff = days.max() - pd.Timedelta(days=holdout_days - 1)
+    train = df_prophet[days < cutoff]
+    if train.empty or train["ds"].dt.normalize().nunique() < 2:
+        raise ValueError(
+            f"Data terlalu pendek untuk evaluasi dengan {holdout_days} hari uji."
+        )
+    actual = df_prophet.loc[days >= cutoff, "y"].groupby(days[days >= cutoff]).mean()
+
+    future = create_future_dataframe(train, periods=holdout_days + 1)
+    future["cap"] = LEAF_CAP
+
+    rows = []
+    for backend in backends:
+        row = {"backend": backend}
+        try:
+            forecaster = get_forecaster(backend, **options)
+            forecaster.load()
+            start = time.perf_counter()
+            forecaster.fit(train)
+            forecast = forecaster.predict(train, future)
+            row["latency_ms"] = (time.perf_counter() - start) * 1000
+        except (ImportError, ValueError) as e:
+            row["error"] = str(e)
+            rows.append(row)
+            continue
+
+        predicted = forecast.groupby(forecast["ds"].dt.normalize())["yhat"].mean()
+        predicted, observed = predicted.align(actual, join="inner")
+        error = predicted - observed
+        # Days without leaves have no relative error
+        nonzero = observed != 0
+        row.update(
+            mae=error.abs().mean(),
+            rmse=np.sqrt((error**2).mean()),
+            mape=(error[nonzero].abs() / observed[nonzero]).mean() * 100,
+            n_days=len(error),
+        )
+        rows.append(row)
+
+    return pd.DataFrame(rows).set_index("backend")
+
+
+def dataset_fingerprint(df):
+    """Return a content hash of a DataFrame (values and column names)."""
+    digest = hashlib.sha256()
+    digest.update("|".join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def forecast_key(
+    df_prophet,
+    model_path=PROPHET_MODEL_PATH,
+    max_day=MAX_DAY,
+    mode="full",
+    uncertainty_samples=None,
+    backend="prophet",
+):
+    """Cache/job key of a full-horizon forecast and the resolved model path."""
+    model_path = resolve_model_path(model_path)
+    forecaster = get_forecaster(backend, model_path, mode, uncertainty_samples)
+    model_id, settings = forecaster.cache_identity()
+    key = forecast_cache_key(df_prophet, model_id, f"{max_day}:{settings}")
+    return key, model_path
+
+
+def submit_forecast_job(
+    df_prophet,
+    model_path=PROPHET_MODEL_PATH,
+    max_day=MAX_DAY,
+    mode="full",
+    uncertainty_samples=None,
+    backend="prophet",
+):
+    """Run forecast_full_horizon on the background job queue.
+
+    Jobs are keyed like the forecast cache (dataset, backend, model and
+    horizon), so reruns and other sessions asking for the same forecast join
+    the running job. The job's StageTimer is in job.meta["timer"]; see
+    claim_job_timer for reporting it once.
+    """
+    key, model_path = forecast_key(
+        df_prophet, model_path, max_day, mode, uncertainty_samples, backend
+    )
+    timer = StageTimer("forecast_job")
+    job = get_job_queue().submit(
+        key,
+        forecast_full_horizon,
+        df_prophet,
+        model_path=model_path,
+        max_day=max_day,
+        timer=timer,
+        mode=mode,
+        uncertainty_samples=uncertainty_samples,
+        backend=backend,
+        cache_key=key,
+    )
+    if job.meta.setdefault("timer", timer) is timer:
+        # A new job, not one joined through the queue
+        job.meta["timer_unclaimed"] = True
+    return job
+
+
+def claim_job_timer(job):
+    """StageTimer of a forecast job for its first caller, None for everyone else.
+
+    Finished jobs are shared by reruns and sessions; only one of them should
+    report the job's stages, the others reused its result.
+    """
+    if job.meta.pop("timer_unclaimed", False):
+        return job.meta["timer"]
+    return None
+
+
+def forecast_full_horizon(
+    df_prophet,
+    model_path=PROPHET_MODEL_PATH,
+    max_day=MAX_DAY,
+    timer=None,
+    mode="full",
+    uncertainty_samples=None,
+    backend="prophet",
+    cache_key=None,
+):
+    """Predict once up to max_day and reuse the result for every shorter horizon.
+
+    backend picks the Forecaster (see FORECASTERS); model_path, mode and
+    uncertainty_samples only apply to Prophet. cache_key is forecast_key() of
+    these arguments (with model_path already resolved) when the caller has it,
+    so the frame is not hashed a second time.
+    """
+    timer = timer if timer is not None else StageTimer("forecast_full_horizon")
+    cache = get_forecast_cache()
+
+    with timer.stage("cache"):
+        key = cache_key
+        if key is None:
+            key, model_path = forecast_key(
+                df_prophet, model_path, max_day, mode, uncertainty_samples, backend
+            )
+        forecast = cache.get(key)
+    if forecast is not None:
+        return forecast
+
+    forecaster = get_forecaster(backend, model_path, mode, uncertainty_samples)
+    with timer.stage("load"):
+        forecaster.load()
+
+    with timer.stage("future-frame"):
+        future = create_future_dataframe(df_prophet, periods=max_day)
+        future["cap"] = LEAF_CAP
+
+    with timer.stage("predict"):
+        start = time.perf_counter()
+        try:
+            forecast = forecaster.predict(df_prophet, future)
+        except Exception:
+            _record_forecaster_call(
+                forecaster.name, time.perf_counter() - start, failed=True
+            )
+            raise
+        _record_forecaster_call(forecaster.name, time.perf_counter() - start)
+
+    cache.put(key, forecast)
+    return forecast
+
+
+def slice_forecast(full_forecast, periods):
+    """Return the first `periods` days of a full-horizon forecast."""
+    # Copy, because the plotting helpers add columns to the frame they get
+    return full_forecast.iloc[:periods].copy()
+
+
+def prophet_config(model, exclude_regressors=()):
+    """Picklable settings of a fitted Prophet, enough to build an unfitted twin."""
+    return {
+        "params": {
+            "growth": model.growth,
+            "n_changepoints": model.n_changepoints,
+            "changepoint_range": model.changepoint_range,
+            "changepoint_prior_scale": model.changepoint_prior_scale,
+            "seasonality_mode": model.seasonality_mode,
+            "seasonality_prior_scale": model.seasonality_prior_scale,
+            "interval_width": model.interval_width,
+            "uncertainty_samples": model.uncertainty_samples,
+            "yearly_seasonality": "yearly" in model.seasonalities,
+            "weekly_seasonality": "weekly" in model.seasonalities,
+            "daily_seasonality": "daily" in model.seasonalities,
+        },
+        "regressors": {
+            name: {
+                "prior_scale": spec["prior_scale"],
+                "standardize": spec["standardize"],
+                "mode": spec["mode"],
+            }
+            for name, spec in model.extra_regressors.items()
+            if name not in exclude_regressors
+        },
+    }
+
+
+def prophet_from_config(config):
+    """Unfitted Prophet built from prophet_config()."""
+    model = Prophet(**config["params"])
+    for name, spec in config["regressors"].items():
+        model.add_regressor(name, **spec)
+    return model
+
+
+# Incremental updates of the Prophet model. Each model family (e.g.
+# ./model/prophet_model.pkl) gets versioned refits ./model/prophet_model_vN.pkl
+# and a manifest ./model/prophet_model.json pointing at the current one.
+def _family_manifest_path(model_path):
+    return os.path.splitext(model_path)[0] + ".json"
+
+
+def read_model_manifest(model_path=PROPHET_MODEL_PATH):
+    manifest_path = _family_manifest_path(model_path)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path) as f:
+        return json.load(f)
+
+
+def resolve_model_path(model_path=PROPHET_MODEL_PATH):
+    """Path of the current version of a model family (the base file if never updated)."""
+    manifest = read_model_manifest(model_path)
+    if manifest is None:
+        return model_path
+    return os.path.join(os.path.dirname(model_path), manifest["artifact"])
+
+
+def stan_init(model):
+    """Fitted parameters of a Prophet model, usable as Stan `init` for a warm start."""
+    return {
+        "k": float(model.params["k"][0][0]),
+        "m": float(model.params["m"][0][0]),
+        "sigma_obs": float(model.params["sigma_obs"][0][0]),
+        "delta": model.params["delta"][0],
+        "beta": model.params["beta"][0],
+    }
+
+
+def training_history(model):
+    """The model's training rows in prepare_data() form (regressors un-standardized)."""
+    columns = ["ds", "y", "cap"] + list(model.extra_regressors)
+    history = model.history[columns].copy()
+    for name, spec in model.extra_regressors.items():
+        history[name] = history[name] * spec["std"] + spec["mu"]
+    return history
+
+
+def update_model(new_rows, model_path=PROPHET_MODEL_PATH):
+    """Refit a Prophet model on its history plus rows newer than the last fit.
+
+    The refit is warm-started from the previous parameters and saved as the
+    next version of the model family. Returns (model, path, updated); when
+    new_rows holds nothing newer than the training history the current model
+    is returned untouched with updated=False.
+    """
+    current_path = resolve_model_path(model_path)
+    current = load_model(current_path)
+
+    history = training_history(current)
+    last_ds = history["ds"].max()
+
+    new_rows = new_rows.copy()
+    new_rows["ds"] = pd.to_datetime(new_rows["ds"])
+    new_rows = new_rows[new_rows["ds"] > last_ds]
+    if new_rows.empty:
+        return current, current_path, False
+
+    new_rows["cap"] = LEAF_CAP
+    train = pd.concat([history, new_rows[history.columns]], ignore_index=True)
+
+    start = time.perf_counter()
+    updated = prophet_from_config(prophet_config(current))
+    updated.fit(train, init=stan_init(current))
+    fit_seconds = time.perf_counter() - start
+
+    manifest = read_model_manifest(model_path) or {"version": 0}
+    version = manifest["version"] + 1
+    artifact = f"{os.path.splitext(os.path.basename(model_path))[0]}_v{version}.pkl"
+    new_path = os.path.join(os.path.dirname(model_path), artifact)
+    joblib.dump(updated, new_path)
+
+    manifest = {
+        "version": version,
+        "artifact": artifact,
+        "previous": os.path.basename(current_path),
+        "rows": len(train),
+        "new_rows": len(new_rows),
+        "last_ds": str(train["ds"].max()),
+        "fit_seconds": round(fit_seconds, 3),
+        "trained_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    manifest_path = _family_manifest_path(model_path)
+    with open(manifest_path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + ".tmp", manifest_path)
+
+    return updated, new_path, True
+
+
+# Quality (growth pattern) classifier artifact
+QUALITY_DATA_PATH = "./dataset/dataset_model_kualitas.csv"
+QUALITY_MODEL_DIR = "./model"
+QUALITY_MANIFEST_PATH = "./model/quality_model.json"
+QUALITY_FEATURE_COLUMNS = [
+    "temperature",
+    "humidity",
+    "light",
+    "pH",
+    "EC",
+    "TDS",
+    "WaterTemp",
+]
+QUALITY_TARGET_COLUMN = "Pattern"
+
+
+def train_quality_model(data_path=QUALITY_DATA_PATH, model_dir=QUALITY_MODEL_DIR):
+    """Fit the quality classifier offline and write a new versioned artifact."""
+    data_path = resolve_data_source(data_path, wait=True)
+    if data_path is None:
+        raise FileNotFoundError("Dataset model kualitas tidak dapat diunduh.")
+    data = load_dataset(data_path)
 
     # Extract features and target
-    X = data[feature_columns]  # Features
-    y = data[target_column]  # Target variable
+    X = data[QUALITY_FEATURE_COLUMNS]
+    y = data[QUALITY_TARGET_COLUMN]
 
     # Split the dataset into training and testing sets
     X_train, X_test, y_train, y_test = train_test_split(
         X, y, test_size=0.2, random_state=42
     )
 
-    # Define the model
-    model = GradientBoostingClassifier(learning_rate=0.1, max_depth=10)
-
-    # Train the model
+    # Define and train the model
+    model = GradientBoostingClassifier(learning_rate=0.1, max_depth=10, random_state=42)
     model.fit(X_train, y_train)
 
-    # Make predictions
-    y_pred = model.predict(X_test)
+    # Calculate accuracy on the held-out split
+    accuracy = accuracy_score(y_test, model.predict(X_test))
 
-    # Calculate accuracy
-    accuracy = accuracy_score(y_test, y_pred)
+    # Next version number comes from the current manifest, if any
+    manifest_path = os.path.join(model_dir, os.path.basename(QUALITY_MANIFEST_PATH))
+    version = 1
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            version = json.load(f)["version"] + 1
 
-    return model, accuracy
+    artifact = f"quality_model_v{version}.joblib"
+    joblib.dump(model, os.path.join(model_dir, artifact), compress=3)
 
+    # Array-backed copy for pickle-free inference, same predictions
+    compiled = f"quality_model_v{version}.npz"
+    compile_model(model).save(os.path.join(model_dir, compiled))
 
-def predict_pattern(model, input_data):
-    # Define the mapping from pattern values to descriptive labels and images
-    pattern_mapping = {
-        1: (
-            "Pattern 1: Normal",
-            "https://github.com/Vinzzztty/Forecasting-Hidroponik/blob/V2/assets/normal.png?raw=true",
-        ),
-        2: (
-            "Pattern 2: Ideal",
-            "https://github.com/Vinzzztty/Forecasting-Hidroponik/blob/V2/assets/optimal.png?raw=true",
-        ),
-        3: (
-            "Pattern 3: Over",
-            "https://github.com/Vinzzztty/Forecasting-Hidroponik/blob/V2/assets/over.png?raw=true",
-        ),
+    manifest = {
+        "version": version,
+        "artifact": artifact,
+        "compiled_artifact": compiled,
+        "accuracy": float(accuracy),
+        "feature_columns": QUALITY_FEATURE_COLUMNS,
+        "target_column": QUALITY_TARGET_COLUMN,
+        "classes": [int(c) for c in model.classes_],
+        "data_sha256": _file_sha256(data_path),
+        "sklearn_version": sklearn.__version__,
+        "trained_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
     }
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
+
+
+def export_quality_model(manifest_path=QUALITY_MANIFEST_PATH):
+    """Compile the current quality artifact to .npz and record it in the manifest."""
+    model, manifest = load_quality_model(manifest_path)
+
+    compiled = f"quality_model_v{manifest['version']}.npz"
+    compile_model(model).save(os.path.join(os.path.dirname(manifest_path), compiled))
+
+    manifest["compiled_artifact"] = compiled
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
+
+
+def load_quality_model(manifest_path=QUALITY_MANIFEST_PATH, compiled=False):
+    """Load the current quality classifier artifact and its manifest.
+
+    With compiled=True the array-backed CompiledEnsemble is loaded instead of
+    the sklearn pickle (see export_quality_model).
+    """
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(
+            f"{manifest_path} tidak ditemukan, jalankan "
+            "`python -m utils.train_quality_model` terlebih dahulu."
+        )
+
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    artifact = manifest["artifact"]
+    if compiled:
+        if "compiled_artifact" not in manifest:
+            raise FileNotFoundError(
+                f"{manifest_path} belum memiliki model terkompilasi, jalankan "
+                "`python -m utils.train_quality_model --export-only`."
+            )
+        artifact = manifest["compiled_artifact"]
+
+    artifact_path = os.path.join(os.path.dirname(manifest_path), artifact)
+    model = load_model(artifact_path)
+
+    if list(model.feature_names_in_) != manifest["feature_columns"]:
+        raise ValueError(
+            f"Skema fitur {artifact_path} tidak sesuai dengan {manifest_path}."
+        )
+
+    return model, manifest
+
+
+def quality_model():
+    # Never trains: the artifact is built offline by train_quality_model
+    model, manifest = load_quality_model()
 
-    # Ensure the input_data is a DataFrame
-    if isinstance(input_data, dict):
-        input_data = pd.DataFrame([input_data])
+    return model, manifest["accuracy"]
 
-    # Make the prediction
-    prediction = model.predict(input_data)[0]
 
-    # Map the prediction to its descriptive label and image URL
-    prediction_label, image_url = pattern_mapping.get(
-        prediction, ("Unknown Pattern", None)
+# Quality classes and how they are shown on the page
+PATTERN_LABELS = {
+    1: "Pattern 1: Normal",
+    2: "Pattern 2: Ideal",
+    3: "Pattern 3: Over",
+}
+PATTERN_IMAGES = {
+    1: "normal.png",
+    2: "optimal.png",
+    3: "over.png",
+}
+
+
+def _quality_features(data):
+    # Feature frame in training column order from a dict, DataFrame or array
+    if isinstance(data, dict):
+        data = pd.DataFrame([data])
+    if isinstance(data, pd.DataFrame):
+        missing = [c for c in QUALITY_FEATURE_COLUMNS if c not in data.columns]
+        if missing:
+            raise ValueError(f"Kolom {missing} tidak ditemukan pada data.")
+        return data[QUALITY_FEATURE_COLUMNS]
+
+    values = np.asarray(data, dtype=float)
+    if values.ndim == 1:
+        values = values[None, :]
+    if values.ndim != 2 or values.shape[1] != len(QUALITY_FEATURE_COLUMNS):
+        raise ValueError(
+            f"Data harus berukuran (n, {len(QUALITY_FEATURE_COLUMNS)}) "
+            f"dengan urutan kolom {QUALITY_FEATURE_COLUMNS}."
+        )
+    return pd.DataFrame(values, columns=QUALITY_FEATURE_COLUMNS)
+
+
+def classify_patterns(model, data):
+    """Label every row of a sensor log with the quality classifier.
+
+    Accepts a dict (one reading), a DataFrame containing the seven sensor
+    columns, or an array with the columns in QUALITY_FEATURE_COLUMNS order.
+    Returns one row per input row with the predicted Pattern, its label and
+    a proba_<pattern> column per class, indexed like the input DataFrame.
+    """
+    features = _quality_features(data)
+
+    # One predict_proba call; the label is the argmax, exactly as model.predict
+    proba = model.predict_proba(features)
+    patterns = model.classes_[proba.argmax(axis=1)]
+
+    result = pd.DataFrame(
+        proba, index=features.index, columns=[f"proba_{c}" for c in model.classes_]
+    )
+    result.insert(0, "Pattern", patterns)
+    result.insert(1, "label", pd.Series(patterns).map(PATTERN_LABELS).to_numpy())
+    result["label"] = result["label"].fillna("Unknown Pattern")
+
+    return result
+
+
+# Labels of whole uploaded logs, so reruns of the page skip predict_proba
+_PATTERN_CACHE = OrderedDict()
+_PATTERN_CACHE_LOCK = threading.Lock()
+PATTERN_CACHE_SIZE = 16
+
+
+def log_patterns(model, df, days):
+    """classify_patterns and daily_patterns of a whole log, memoized per dataset.
+
+    `days` must be derived from df (e.g. visualization.day_index(df)). Entries
+    are keyed by the dataset fingerprint and the model object, which the entry
+    keeps alive, so a reloaded model never reuses another model's labels.
+    """
+    key = (dataset_fingerprint(df), id(model))
+    with _PATTERN_CACHE_LOCK:
+        if key in _PATTERN_CACHE:
+            _PATTERN_CACHE.move_to_end(key)
+            return _PATTERN_CACHE[key][1:]
+
+    patterns = classify_patterns(model, df)
+    pattern_days = daily_patterns(patterns, days)
+
+    with _PATTERN_CACHE_LOCK:
+        _PATTERN_CACHE[key] = (model, patterns, pattern_days)
+        while len(_PATTERN_CACHE) > PATTERN_CACHE_SIZE:
+            _PATTERN_CACHE.popitem(last=False)
+    return patterns, pattern_days
+
+
+def daily_patterns(patterns, days):
+    """Majority Pattern per day from the output of classify_patterns.
+
+    `days` is aligned with `patterns` (e.g. the log's 'day' column). Ties go to
+    the pattern with the highest mean probability on that day.
+    """
+    days = pd.Series(np.asarray(days), index=patterns.index, name="day")
+    counts = pd.crosstab(days, patterns["Pattern"])
+    proba_columns = [c for c in patterns.columns if c.startswith("proba_")]
+    mean_proba = patterns[proba_columns].groupby(days).mean()
+    mean_proba.columns = [int(c.removeprefix("proba_")) for c in proba_columns]
+    mean_proba = mean_proba.reindex(columns=counts.columns)
+
+    # Break count ties with a sub-unit bonus from the mean probability
+    winner = (counts + mean_proba * 0.5).idxmax(axis=1)
+    n_rows = counts.sum(axis=1)
+
+    return pd.DataFrame(
+        {
+            "Pattern": winner,
+            "label": winner.map(PATTERN_LABELS).fillna("Unknown Pattern"),
+            "share": counts.max(axis=1) / n_rows,
+            "n_rows": n_rows,
+        }
     )
 
+
+def predict_pattern(model, input_data):
+    # Streamlit wrapper around classify_patterns for a single reading
+    prediction = classify_patterns(model, input_data).iloc[0]
+    prediction_label = prediction["label"]
+    image_name = PATTERN_IMAGES.get(prediction["Pattern"])
+    image_url = asset_url(image_name, 500) if image_name else None
+
     # Display the corresponding image and label centered
     if image_url:
         st.markdown(
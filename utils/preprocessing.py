@@ -0,0 +1,185 @@
+import numpy as np
+import pandas as pd
+
+# Tanggal tanam yang dipakai saat CSV hanya berisi kolom 'day' dan 'time'
+START_DATE = pd.Timestamp("2024-07-01")
+
+# Kolom yang dipakai oleh seluruh pipeline forecasting
+IMPORTANT_COLUMNS = [
+    "datetime",
+    "LeafCount",
+    "hole",
+    "temperature",
+    "humidity",
+    "light",
+    "pH",
+    "EC",
+    "TDS",
+    "WaterTemp",
+]
+
+DEFAULT_CHUNKSIZE = 100_000
+# A day/time export repeats readings; these columns identify one reading
+DEDUP_COLUMNS = ["datetime", "LeafCount"]
+# Hole numbers start at 1; larger values are corrupt readings, not holes
+MAX_HOLE = np.iinfo(np.int16).max
+
+
+def build_datetime(day, time, start_date=START_DATE):
+    """Vectorized 'day' + decimal 'time' (e.g. 9.19 -> 09:19) to timestamps."""
+    time = pd.to_numeric(pd.Series(time), errors="coerce").to_numpy(dtype=float)
+    day = pd.Series(day).to_numpy(dtype=np.int64)
+
+    if np.isnan(time).any():
+        raise ValueError("Kolom 'time' berisi nilai kosong atau bukan angka.")
+
+    # 9.19 -> 919 -> (9 jam, 19 menit); rint mirrors the old "{:.2f}" formatting
+    hhmm = np.rint(time * 100).astype(np.int64)
+    hours, minutes = np.divmod(hhmm, 100)
+    if ((hhmm < 0) | (hours > 23) | (minutes > 59)).any():
+        raise ValueError("Kolom 'time' harus berformat jam.menit, misalnya 9.19.")
+
+    offset_minutes = (day - 1) * 1440 + hours * 60 + minutes
+    return pd.Timestamp(start_date) + pd.to_timedelta(offset_minutes, unit="m")
+
+
+def add_datetime_from_day_time(df, start_date=START_DATE):
+    """Build the 'datetime' column from 'day'/'time', deduplicate and sort by it."""
+    df = df.copy()
+    df["day"] = df["day"].astype(int)
+    df["datetime"] = build_datetime(df["day"], df["time"], start_date)
+
+    # (day, time) maps one-to-one onto datetime, so this matches the old
+    # drop_duplicates(subset=["day", "time", "LeafCount"])
+    df = df.drop_duplicates(subset=["datetime", "LeafCount"])
+
+    df = df.set_index("datetime", drop=False)
+    return df.sort_index()
+
+
+def preprocess_data(df):
+    """UI-free preprocessing: ensure 'datetime' exists and keep the important columns.
+
+    Raises ValueError with a user-facing message when the file cannot be used.
+    """
+    if "datetime" not in df.columns:
+        for column in ("day", "time"):
+            if column not in df.columns:
+                raise ValueError(f"Kolom '{column}' tidak ditemukan pada file CSV.")
+        df = add_datetime_from_day_time(df)
+
+    # Convert 'datetime' column to datetime format if it's not already
+    if not pd.api.types.is_datetime64_any_dtype(df["datetime"]):
+        df = df.copy()
+        df["datetime"] = pd.to_datetime(df["datetime"], errors="coerce")
+
+        if df["datetime"].isnull().any():
+            raise ValueError("Ada nilai yang tidak bisa dikonversi ke format datetime.")
+
+    missing = [column for column in IMPORTANT_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"Kolom {', '.join(missing)} tidak ditemukan pada file CSV.")
+
+    return df[IMPORTANT_COLUMNS]
+
+
+def _normalize_chunk(chunk, start_date):
+    # Give one chunk a proper 'datetime' column, whatever the export format
+    if "datetime" in chunk.columns:
+        chunk["datetime"] = pd.to_datetime(chunk["datetime"], errors="coerce")
+        if chunk["datetime"].isnull().any():
+            raise ValueError("Ada nilai yang tidak bisa dikonversi ke format datetime.")
+    else:
+        for column in ("day", "time"):
+            if column not in chunk.columns:
+                raise ValueError(f"Kolom '{column}' tidak ditemukan pada file CSV.")
+        chunk["datetime"] = build_datetime(chunk["day"], chunk["time"], start_date)
+    return chunk
+
+
+def _check_hole(hole):
+    # Validate before narrowing, so a bad value is reported instead of wrapped
+    hole = pd.to_numeric(hole, errors="coerce")
+    valid = hole.notna() & (hole >= 1) & (hole <= MAX_HOLE) & (hole % 1 == 0)
+    if not valid.all():
+        raise ValueError(
+            f"Kolom 'hole' harus berisi nomor lubang bulat antara 1 dan {MAX_HOLE}."
+        )
+    return hole.astype(np.int64)
+
+
+def _downcast(column):
+    # Smallest dtype that holds every value exactly; to_numeric never wraps ints
+    if pd.api.types.is_integer_dtype(column):
+        return pd.to_numeric(column, downcast="integer")
+    if pd.api.types.is_float_dtype(column):
+        narrow = pd.to_numeric(column, downcast="float")
+        # float32 rounds most decimal readings (26.8), which would change
+        # Prophet's regressor values, so only exact narrowing is kept
+        if np.array_equal(
+            narrow.to_numpy(np.float64), column.to_numpy(np.float64), equal_nan=True
+        ):
+            return narrow
+    return column
+
+
+def read_sensor_csv(source, chunksize=DEFAULT_CHUNKSIZE, start_date=START_DATE):
+    """Stream a sensor CSV in chunks into a preprocessed frame.
+
+    Holds the same rows and values as preprocess_data(pd.read_csv(source)),
+    with every numeric column narrowed to the smallest dtype that stores it
+    exactly (hole is usually int8). Only one raw chunk is held at a time, and
+    duplicate (datetime, LeafCount) readings of day/time exports are dropped
+    as the chunks arrive, the first reading winning as in a single read.
+    Raises ValueError for unreadable files and invalid 'hole' values.
+    """
+    wanted = set(IMPORTANT_COLUMNS) | {"day", "time"}
+    try:
+        reader = pd.read_csv(
+            source,
+            chunksize=chunksize,
+            usecols=lambda column: column in wanted,
+        )
+        parts = []
+        from_day_time = None
+        # (datetime, LeafCount) of every reading kept so far
+        seen = None
+
+        for chunk in reader:
+            if from_day_time is None:
+                from_day_time = "datetime" not in chunk.columns
+            chunk = _normalize_chunk(chunk, start_date)
+
+            missing = [c for c in IMPORTANT_COLUMNS if c not in chunk.columns]
+            if missing:
+                raise ValueError(
+                    f"Kolom {', '.join(missing)} tidak ditemukan pada file CSV."
+                )
+            chunk = chunk[IMPORTANT_COLUMNS]
+
+            if from_day_time:
+                # Exact comparison, so distinct readings are never merged
+                chunk = chunk.drop_duplicates(subset=DEDUP_COLUMNS)
+                keys = pd.MultiIndex.from_frame(chunk[DEDUP_COLUMNS])
+                if seen is not None:
+                    new = ~keys.isin(seen)
+                    chunk, keys = chunk[new], keys[new]
+                seen = keys if seen is None else seen.append(keys)
+
+            chunk = chunk.assign(hole=_check_hole(chunk["hole"]))
+            parts.append(
+                chunk.assign(
+                    **{c: _downcast(chunk[c]) for c in chunk if c != "datetime"}
+                )
+            )
+    except (TypeError, pd.errors.ParserError) as e:
+        raise ValueError(f"File CSV tidak dapat dibaca: {e}") from e
+
+    if not parts:
+        raise ValueError("File CSV tidak berisi data.")
+
+    # Parts hold only kept, narrowed rows; concat widens to a common dtype
+    df = pd.concat(parts, ignore_index=True)
+    if from_day_time:
+        df = df.set_index("datetime", drop=False).sort_index()
+    return df
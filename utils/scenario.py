@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+from .model import (
+    LEAF_CAP,
+    MAX_DAY,
+    PROPHET_MODEL_PATH,
+    create_future_dataframe,
+    load_model,
+    make_predictions,
+    resolve_model_path,
+)
+
+REGRESSOR_COLUMNS = [
+    "hole",
+    "temperature",
+    "humidity",
+    "light",
+    "pH",
+    "EC",
+    "TDS",
+    "WaterTemp",
+]
+
+
+def _levels(spec):
+    # (start, stop, step) -> inclusive range; anything else is a list of levels
+    if isinstance(spec, tuple) and len(spec) == 3:
+        start, stop, step = spec
+        return np.arange(start, stop + step / 2, step)
+    return np.atleast_1d(np.asarray(spec))
+
+
+def scenario_grid(**ranges):
+    """Cartesian product of regressor levels, one row per scenario.
+
+    scenario_grid(EC=(900, 1800, 100), pH=(5.5, 7.5, 0.5)) gives 10 x 5 scenarios.
+    """
+    names = list(ranges)
+    grids = np.meshgrid(*[_levels(ranges[name]) for name in names], indexing="ij")
+    scenarios = pd.DataFrame({name: grid.ravel() for name, grid in zip(names, grids)})
+    scenarios.index.name = "scenario"
+    return scenarios
+
+
+def build_scenario_future(df_prophet, scenarios, periods=MAX_DAY):
+    """Stack one future frame per scenario into a single frame.
+
+    `scenarios` either has one row per scenario (levels held constant over the
+    horizon) or is long-format with 'scenario' and 'day' (1-based) columns giving
+    a per-day trajectory. Regressors not in `scenarios` keep the last observed
+    value, as in create_future_dataframe.
+    """
+    base = create_future_dataframe(df_prophet, periods=periods)
+    base["cap"] = LEAF_CAP
+
+    if "day" in scenarios.columns:
+        trajectories = scenarios.sort_values(["scenario", "day"])
+        ids = trajectories["scenario"].unique()
+        n_scenarios = len(ids)
+        if len(trajectories) != n_scenarios * periods:
+            raise ValueError("Setiap skenario harus punya satu nilai per hari.")
+        overrides = trajectories.drop(columns=["scenario", "day"])
+    else:
+        ids = scenarios.index.to_numpy()
+        n_scenarios = len(ids)
+        overrides = scenarios.loc[scenarios.index.repeat(periods)]
+
+    unknown = set(overrides.columns) - set(REGRESSOR_COLUMNS)
+    if unknown:
+        raise ValueError(f"Bukan regressor model: {', '.join(sorted(unknown))}")
+
+    # Scenario-major stacking: rows [s * periods + d]
+    future = base.loc[np.tile(np.arange(periods), n_scenarios)].reset_index(drop=True)
+    for column in overrides.columns:
+        future[column] = overrides[column].to_numpy()
+    future.insert(0, "scenario", np.repeat(ids, periods))
+    future.insert(1, "day", np.tile(np.arange(1, periods + 1), n_scenarios))
+    return future
+
+
+def simulate_scenarios(
+    df_prophet,
+    scenarios,
+    periods=MAX_DAY,
+    model_path=PROPHET_MODEL_PATH,
+    intervals=False,
+):
+    """Score every scenario in one batched Prophet predict.
+
+    Returns the stacked frame (scenario, day, ds, regressors, yhat[, bounds]);
+    use scenario_cube() for a (scenario x day) array.
+    """
+    prophet_model = load_model(resolve_model_path(model_path))
+
+    future = build_scenario_future(df_prophet, scenarios, periods)
+
+    # Prophet sorts its input by ds. A per-scenario nanosecond offset makes every
+    # ds unique, so the sorted output lines up row by row with the sorted input.
+    offsets = pd.to_timedelta(pd.factorize(future["scenario"])[0], unit="ns")
+    order = np.lexsort((offsets.to_numpy(), future["ds"].to_numpy()))
+    stacked = future.iloc[order].reset_index(drop=True)
+    stacked_ds = stacked["ds"]
+    stacked["ds"] = stacked_ds + offsets[order]
+
+    forecast = make_predictions(
+        prophet_model,
+        stacked.drop(columns=["scenario", "day"]),
+        mode="full" if intervals else "point",
+    )
+    columns = ["yhat", "yhat_lower", "yhat_upper"] if intervals else ["yhat"]
+    result = stacked.assign(ds=stacked_ds)
+    result[columns] = forecast[columns].to_numpy()
+
+    return result.sort_values(["scenario", "day"], kind="mergesort").reset_index(
+        drop=True
+    )
+
+
+def scenario_cube(result, column="yhat"):
+    """(n_scenarios, n_days) array of one output column of simulate_scenarios."""
+    n_scenarios = result["scenario"].nunique()
+    return result[column].to_numpy().reshape(n_scenarios, -1)
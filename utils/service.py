@@ -0,0 +1,484 @@
+"""HTTP/JSON service for the forecasting pipeline, next to the Streamlit app.
+
+    python -m utils.service [--host 0.0.0.0] [--port 8000] [--compiled]
+    uvicorn utils.service:app --port 8000
+
+Endpoints (POST bodies are sensor rows, see read_frame):
+    GET  /health        loaded models, batching, job and cache counters
+    POST /forecast      ?periods=1..MAX_DAY&mode=full|point&backend=prophet|logistic|arima
+    POST /classify      growth Pattern and class probabilities per row
+    POST /optimization  evaluate_ranges summary and check_optimization text
+
+Models are loaded once at startup into the process-wide model registry.
+Forecasts run on the shared job queue, so identical concurrent requests (and
+the Forecasting page) share one computation and the forecast cache. Classify
+requests that queue up while a batch is being scored are scored together with
+a single predict_proba call.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from io import BytesIO
+
+import pandas as pd
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+except ImportError:  # pragma: no cover - pyarrow is optional at runtime
+    pa = None
+
+from .cek_optimization import (
+    OPTIMAL_CONDITIONS,
+    check_optimization,
+    evaluate_ranges,
+    summarize_forecast,
+)
+from .forecast_cache import get_forecast_cache
+from .jobs import get_job_queue
+from .model import (
+    INTERACTIVE_UNCERTAINTY_SAMPLES,
+    MAX_DAY,
+    PROPHET_MODEL_PATH,
+    QUALITY_FEATURE_COLUMNS,
+    QUALITY_MANIFEST_PATH,
+    FORECASTERS,
+    classify_patterns,
+    forecaster_stats,
+    load_model,
+    load_quality_model,
+    model_cache_stats,
+    prepare_data,
+    resolve_model_path,
+    slice_forecast,
+    submit_forecast_job,
+)
+from .preprocessing import IMPORTANT_COLUMNS, preprocess_data, read_sensor_csv
+
+SERVICE_HOST = os.environ.get("HYDROSIM_SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.environ.get("PORT", "8000"))
+# "1" serves the classifier from the compiled .npz instead of the sklearn pickle
+SERVICE_COMPILED = os.environ.get("HYDROSIM_SERVICE_COMPILED", "0") == "1"
+
+# Extra seconds the first classify request of a batch waits for others. Under
+# load requests already queue up while the previous batch is scored, so no
+# wait is needed and a lone request is not delayed.
+CLASSIFY_BATCH_WINDOW = 0
+# Rows scored per predict_proba call at most
+CLASSIFY_BATCH_MAX_ROWS = 65536
+# Largest request body accepted, in bytes
+MAX_BODY_BYTES = 64 * 2**20
+
+CSV_TYPE = "text/csv"
+ARROW_STREAM_TYPE = "application/vnd.apache.arrow.stream"
+ARROW_FILE_TYPE = "application/vnd.apache.arrow.file"
+
+
+class RequestError(Exception):
+    """Client error, answered with the given HTTP status and message."""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ModelPool:
+    """Models the service answers with, loaded before the first request.
+
+    The models live in the model registry of utils.model, so a retrained
+    artifact is still picked up without restarting the service.
+    """
+
+    def __init__(
+        self,
+        prophet_path=PROPHET_MODEL_PATH,
+        quality_manifest=QUALITY_MANIFEST_PATH,
+        compiled=SERVICE_COMPILED,
+    ):
+        self.prophet_path = prophet_path
+        self.quality_manifest = quality_manifest
+        self.compiled = compiled
+        self.loaded = {}
+
+    def load(self):
+        start = time.perf_counter()
+        prophet_path = resolve_model_path(self.prophet_path)
+        load_model(prophet_path)
+        self.loaded["prophet"] = {
+            "path": prophet_path,
+            "seconds": time.perf_counter() - start,
+        }
+
+        start = time.perf_counter()
+        _, manifest = load_quality_model(self.quality_manifest, compiled=self.compiled)
+        self.loaded["quality"] = {
+            "version": manifest["version"],
+            "compiled": self.compiled,
+            "accuracy": manifest["accuracy"],
+            "seconds": time.perf_counter() - start,
+        }
+
+    def quality(self):
+        # Registry hit unless the artifact changed on disk
+        return load_quality_model(self.quality_manifest, compiled=self.compiled)[0]
+
+
+class ClassifierBatcher:
+    """Scores concurrent classify requests together.
+
+    The first request of a batch waits `window` seconds; every request queued
+    by then (up to max_rows rows, in arrival order) is concatenated, classified with one
+    classify_patterns call on a worker thread, and split back per request.
+    Requests arriving while a batch runs form the next one.
+    """
+
+    def __init__(
+        self, pool, window=CLASSIFY_BATCH_WINDOW, max_rows=CLASSIFY_BATCH_MAX_ROWS
+    ):
+        self.pool = pool
+        self.window = window
+        self.max_rows = max_rows
+        self._queue = None
+        self._worker = None
+        self._stats = {"requests": 0, "rows": 0, "batches": 0, "largest_batch": 0}
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def classify(self, features):
+        # Validated per request: one bad request must not fail its whole batch
+        missing = [c for c in QUALITY_FEATURE_COLUMNS if c not in features.columns]
+        if missing:
+            raise RequestError(f"Kolom {missing} tidak ditemukan pada data.")
+        try:
+            features = features[QUALITY_FEATURE_COLUMNS].astype(float)
+        except (TypeError, ValueError):
+            raise RequestError("Nilai sensor harus berupa angka.")
+        if features.isna().to_numpy().any():
+            raise RequestError("Nilai sensor tidak boleh kosong.")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((features, future))
+        return await future
+
+    def stats(self):
+        return dict(self._stats)
+
+    def _score(self, frames):
+        combined = pd.concat(frames, ignore_index=True)
+        return classify_patterns(self.pool.quality(), combined)
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            await asyncio.sleep(self.window)
+
+            rows = len(batch[0][0])
+            while rows < self.max_rows and not self._queue.empty():
+                item = self._queue.get_nowait()
+                batch.append(item)
+                rows += len(item[0])
+
+            # Requests whose client went away are not scored
+            batch = [(frame, future) for frame, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            try:
+                result = await run_in_threadpool(
+                    self._score, [frame for frame, _ in batch]
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self._stats["requests"] += len(batch)
+            self._stats["rows"] += rows
+            self._stats["batches"] += 1
+            self._stats["largest_batch"] = max(self._stats["largest_batch"], len(batch))
+
+            start = 0
+            for frame, future in batch:
+                part = result.iloc[start : start + len(frame)]
+                start += len(frame)
+                if not future.done():
+                    future.set_result(part.set_axis(frame.index))
+
+
+def _media_type(header):
+    return header.split(";")[0].strip().lower()
+
+
+def _read_arrow(body, media_type):
+    if pa is None:
+        raise RequestError("pyarrow diperlukan untuk body Arrow.", 415)
+    reader = ipc.open_stream if media_type == ARROW_STREAM_TYPE else ipc.open_file
+    return reader(pa.BufferReader(body)).read_pandas()
+
+
+def _read_json(body):
+    payload = json.loads(body)
+    # {"rows": [...]} with options, a bare list of rows, or one reading
+    if isinstance(payload, dict):
+        payload = payload.get("rows", [payload])
+    if not isinstance(payload, list) or not payload:
+        raise RequestError("Body JSON harus berisi daftar baris data.")
+    try:
+        return pd.DataFrame.from_records(payload)
+    except TypeError:
+        # e.g. [1, 2]: rows that are not objects
+        raise RequestError("Setiap baris pada body JSON harus berupa objek.")
+
+
+async def read_frame(request, sensor_log=False):
+    """Parse the request body into a DataFrame.
+
+    JSON (a list of rows, {"rows": [...]}, or one row object), CSV (text/csv)
+    or Arrow IPC (stream or file format) bodies are accepted. With sensor_log
+    a CSV body goes through read_sensor_csv, like an uploaded file.
+    """
+    body = await request.body()
+    if not body:
+        raise RequestError("Body permintaan kosong.")
+    if len(body) > MAX_BODY_BYTES:
+        raise RequestError("Body permintaan terlalu besar.", 413)
+
+    media_type = _media_type(request.headers.get("content-type", "application/json"))
+    try:
+        if media_type in (CSV_TYPE, "application/csv"):
+            if sensor_log:
+                return await run_in_threadpool(read_sensor_csv, BytesIO(body))
+            return await run_in_threadpool(pd.read_csv, BytesIO(body))
+        if media_type in (ARROW_STREAM_TYPE, ARROW_FILE_TYPE):
+            return await run_in_threadpool(_read_arrow, body, media_type)
+        if media_type in ("application/json", ""):
+            return await run_in_threadpool(_read_json, body)
+    except (ValueError, pd.errors.ParserError) as e:
+        raise RequestError(f"Body tidak dapat dibaca: {e}") from e
+    except Exception as e:
+        if pa is not None and isinstance(e, pa.ArrowException):
+            raise RequestError(f"Body Arrow tidak dapat dibaca: {e}") from e
+        raise
+
+    raise RequestError(f"Content-Type {media_type} tidak didukung.", 415)
+
+
+def respond(request, frame, **extra):
+    """Answer with frame in the format the client accepts.
+
+    Arrow stream or CSV when asked for in the Accept header (the extra fields
+    are then left out), otherwise JSON {**extra, "rows": [...]}.
+    """
+    accept = request.headers.get("accept", "")
+    if ARROW_STREAM_TYPE in accept and pa is not None:
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return Response(sink.getvalue().to_pybytes(), media_type=ARROW_STREAM_TYPE)
+    if CSV_TYPE in accept:
+        return Response(frame.to_csv(index=False), media_type=CSV_TYPE)
+
+    # pandas serializes the rows (timestamps, NaN/NaT as null) much faster
+    # than building Python records, so the object is assembled around it
+    rows = frame.to_json(orient="records", date_format="iso")
+    head = json.dumps(extra, ensure_ascii=False)[:-1]
+    body = f'{head}, "rows": {rows}}}' if extra else f'{{"rows": {rows}}}'
+    return Response(body, media_type="application/json")
+
+
+def _option(request, name, default, cast):
+    value = request.query_params.get(name)
+    if value is None:
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        raise RequestError(f"Parameter {name}={value!r} tidak valid.")
+
+
+async def health(request):
+    state = request.app.state
+    return JSONResponse(
+        {
+            "status": "ok",
+            "models": state.pool.loaded,
+            "classify_batching": state.batcher.stats(),
+            "jobs": get_job_queue().stats(),
+            "model_cache": model_cache_stats(),
+            "forecasters": forecaster_stats(),
+            "forecast_cache": dict(get_forecast_cache().stats),
+        }
+    )
+
+
+async def forecast(request):
+    periods = _option(request, "periods", MAX_DAY, int)
+    mode = _option(request, "mode", "full", str)
+    backend = _option(request, "backend", "prophet", str)
+    if not 1 <= periods <= MAX_DAY:
+        raise RequestError(f"periods harus antara 1 dan {MAX_DAY}.")
+    if mode not in ("full", "point"):
+        raise RequestError("mode harus 'full' atau 'point'.")
+    if backend not in FORECASTERS:
+        raise RequestError(f"backend harus salah satu dari {', '.join(FORECASTERS)}.")
+
+    raw = await read_frame(request, sensor_log=True)
+    try:
+        df = await run_in_threadpool(preprocess_data, raw)
+    except ValueError as e:
+        raise RequestError(str(e))
+    # JSON values can be anything; Prophet and the summary need numbers
+    numeric = [column for column in IMPORTANT_COLUMNS if column != "datetime"]
+    values = df[numeric].apply(pd.to_numeric, errors="coerce")
+    invalid = [c for c in numeric if values[c].isna().any()]
+    if invalid:
+        raise RequestError(
+            f"Kolom {invalid} harus berisi angka dan tidak boleh kosong."
+        )
+    df = df.assign(**values)
+    df_prophet = await run_in_threadpool(prepare_data, df)
+
+    # Full horizon, same job/cache key as the Forecasting page. Submitting
+    # hashes the frame and the model file, so it stays off the event loop.
+    try:
+        job = await run_in_threadpool(
+            submit_forecast_job,
+            df_prophet,
+            model_path=request.app.state.pool.prophet_path,
+            max_day=MAX_DAY,
+            mode=mode,
+            uncertainty_samples=(
+                INTERACTIVE_UNCERTAINTY_SAMPLES if mode == "full" else None
+            ),
+            backend=backend,
+        )
+    except RuntimeError as e:
+        # The job queue is full
+        raise RequestError(str(e), 503)
+    try:
+        full_forecast = await asyncio.wrap_future(job.future)
+    except (ImportError, ValueError) as e:
+        # Backend not installed, or too little data for it
+        raise RequestError(str(e))
+    result = slice_forecast(full_forecast, periods)
+
+    columns = [
+        column
+        for column in ["ds", "yhat", "yhat_lower", "yhat_upper"]
+        if column in result.columns
+    ]
+    return respond(
+        request,
+        result[columns],
+        periods=periods,
+        mode=mode,
+        backend=backend,
+        summary=summarize_forecast(df, result, periods),
+    )
+
+
+async def classify(request):
+    raw = await read_frame(request)
+    result = await request.app.state.batcher.classify(raw)
+    return respond(request, result)
+
+
+async def optimization(request):
+    raw = await read_frame(request)
+    missing = [c for c in OPTIMAL_CONDITIONS if c not in raw.columns]
+    if missing:
+        raise RequestError(f"Kolom {missing} tidak ditemukan pada data.")
+
+    def evaluate():
+        evaluation = evaluate_ranges(raw)
+        return evaluation["summary"], check_optimization(raw, evaluation)
+
+    try:
+        summary, conclusions = await run_in_threadpool(evaluate)
+    except (KeyError, ValueError) as e:
+        raise RequestError(f"Data tidak dapat dievaluasi: {e}")
+    return respond(
+        request,
+        summary.rename_axis("feature").reset_index(),
+        conclusions=conclusions,
+    )
+
+
+async def request_error(request, exc):
+    return JSONResponse({"error": str(exc)}, status_code=exc.status_code)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    await run_in_threadpool(app.state.pool.load)
+    app.state.batcher.start()
+    try:
+        yield
+    finally:
+        await app.state.batcher.stop()
+
+
+def create_app(pool=None):
+    """Build the ASGI app; `pool` defaults to the Prophet and quality models."""
+    app = Starlette(
+        routes=[
+            Route("/health", health, methods=["GET"]),
+            Route("/forecast", forecast, methods=["POST"]),
+            Route("/classify", classify, methods=["POST"]),
+            Route("/optimization", optimization, methods=["POST"]),
+        ],
+        exception_handlers={RequestError: request_error},
+        lifespan=lifespan,
+    )
+    app.state.pool = pool if pool is not None else ModelPool()
+    app.state.batcher = ClassifierBatcher(app.state.pool)
+    return app
+
+
+app = create_app()
+
+
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(
+        description="Layanan HTTP untuk forecasting, klasifikasi pola, dan cek optimasi."
+    )
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument(
+        "--compiled",
+        action="store_true",
+        help="pakai model kualitas terkompilasi (.npz)",
+    )
+    args = parser.parse_args(argv)
+
+    # A single process: the model pool, batcher and caches are per process
+    if args.compiled:
+        app.state.pool.compiled = True
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
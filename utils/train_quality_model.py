@@ -0,0 +1,47 @@
+import argparse
+
+import os
+
+from .model import (
+    QUALITY_DATA_PATH,
+    QUALITY_MANIFEST_PATH,
+    QUALITY_MODEL_DIR,
+    export_quality_model,
+    train_quality_model,
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Latih ulang model kualitas (Pattern) dan simpan artefak baru."
+    )
+    parser.add_argument("--data", default=QUALITY_DATA_PATH)
+    parser.add_argument("--model-dir", default=QUALITY_MODEL_DIR)
+    parser.add_argument(
+        "--export-only",
+        action="store_true",
+        help="hanya kompilasi model saat ini ke .npz, tanpa melatih ulang",
+    )
+    args = parser.parse_args(argv)
+
+    if args.export_only:
+        manifest_path = os.path.join(
+            args.model_dir, os.path.basename(QUALITY_MANIFEST_PATH)
+        )
+        manifest = export_quality_model(manifest_path)
+        print(
+            f"Model kualitas v{manifest['version']} dikompilasi ke "
+            f"{args.model_dir}/{manifest['compiled_artifact']}"
+        )
+        return
+
+    manifest = train_quality_model(args.data, args.model_dir)
+    print(
+        f"Model kualitas v{manifest['version']} disimpan ke "
+        f"{args.model_dir}/{manifest['artifact']} "
+        f"(accuracy {manifest['accuracy']:.4f})"
+    )
+
+
+if __name__ == "__main__":
+    main()
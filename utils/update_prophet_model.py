@@ -0,0 +1,26 @@
+import argparse
+
+from .datasets import load_dataset
+from .model import PROPHET_MODEL_PATH, prepare_data, update_model
+from .preprocessing import preprocess_data
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Perbarui model Prophet dengan data LeafCount terbaru (warm start)."
+    )
+    parser.add_argument("csv", nargs="+", help="file CSV berisi data baru")
+    parser.add_argument("--model", default=PROPHET_MODEL_PATH)
+    args = parser.parse_args(argv)
+
+    for path in args.csv:
+        new_rows = prepare_data(preprocess_data(load_dataset(path)))
+        _, model_path, updated = update_model(new_rows, model_path=args.model)
+        if updated:
+            print(f"{path}: model baru disimpan ke {model_path}")
+        else:
+            print(f"{path}: tidak ada data baru, {model_path} tetap dipakai")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,51 @@
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objs as go
+import threading
+from collections import OrderedDict
 
+from .downsample import downsample_frame, downsample_xy
+from .model import dataset_fingerprint
+
+# Upper bound on animation frames/slider steps, whatever the horizon
+ANIMATION_MAX_FRAMES = 60
+ANIMATION_FRAME_DURATION = 500
+
+
+def _animation_steps(n_points, max_frames):
+    # Evenly spaced 1-based end positions, always ending on the last point
+    if n_points <= max_frames:
+        return list(range(1, n_points + 1))
+    return sorted(
+        set(np.linspace(1, n_points, max_frames).round().astype(int).tolist())
+    )
+
+
+def plot_forecast(
+    forecast, periods, animation="reveal", max_frames=ANIMATION_MAX_FRAMES
+):
+    # animation="reveal": the series is sent once and frames only move the x-axis
+    #   range, so the payload grows linearly with the horizon.
+    # animation="frames": one data frame per step (capped at max_frames).
+    # animation=None: static figure.
 
-def plot_forecast(forecast, periods):
     # Calculate the number of days since the first date in the forecast
     forecast["day"] = (forecast["ds"] - forecast["ds"].min()).dt.days + 1
 
+    # Long horizons are reduced to a pixel budget before plotting
+    points = downsample_frame(forecast, "day", "yhat")
+
     # Create a figure
     fig = go.Figure()
 
     # Add the forecasted values
     fig.add_trace(
         go.Scatter(
-            x=forecast["day"],
-            y=forecast["yhat"],
+            x=points["day"],
+            y=points["yhat"],
             mode="lines+markers",
             name="Forecast",
             line=dict(color="red", dash="dash"),
@@ -26,8 +55,8 @@ def plot_forecast(forecast, periods):
     # Add the uncertainty intervals
     fig.add_trace(
         go.Scatter(
-            x=forecast["day"].tolist() + forecast["day"][::-1].tolist(),
-            y=forecast["yhat_upper"].tolist() + forecast["yhat_lower"][::-1].tolist(),
+            x=points["day"].tolist() + points["day"][::-1].tolist(),
+            y=points["yhat_upper"].tolist() + points["yhat_lower"][::-1].tolist(),
             fill="toself",
             fillcolor="rgba(255, 0, 0, 0.2)",
             line=dict(color="rgba(255, 255, 255, 0)"),
@@ -51,48 +80,81 @@ def plot_forecast(forecast, periods):
         )
     )
 
-    # Add animation frames
-    frames = [
-        go.Frame(
-            data=[
-                go.Scatter(
-                    x=forecast["day"][:i],
-                    y=forecast["yhat"][:i],
-                    mode="lines+markers",
-                    name="Forecast",
-                    line=dict(color="red", dash="dash"),
-                )
-            ],
-            name=str(i),
-        )
-        for i in range(1, len(forecast) + 1)
-    ]
-
-    fig.update(frames=frames)
-
     # Customize the layout
     fig.update_layout(
         title=f"Perkiraan Jumlah Daun untuk {periods} Hari ke Depan",
         xaxis_title="Hari",
         yaxis_title="Jumlah Daun",
         legend=dict(font=dict(size=12)),
+    )
+
+    if not animation or len(points) < 2:
+        return fig
+
+    days = points["day"].to_numpy()
+    steps = _animation_steps(len(points), max_frames)
+
+    # Slider position of the figure as first shown, and whether Play resumes
+    # from it or restarts at the first frame
+    active = 0
+    from_current = True
+
+    if animation == "reveal":
+        # Fixed axes; each frame only widens the visible x range. The figure
+        # opens on the full range (the last frame), Play restarts the reveal.
+        x_min = days[0] - 0.5
+        y_max = max(forecast["yhat_upper"].max(), max_y) * 1.1
+        fig.update_layout(
+            xaxis=dict(range=[x_min, days[-1] + 0.5]),
+            yaxis=dict(range=[0, y_max]),
+        )
+        active = len(steps) - 1
+        from_current = False
+        frames = [
+            go.Frame(
+                layout=dict(xaxis=dict(range=[x_min, days[i - 1] + 0.5])),
+                name=str(i),
+            )
+            for i in steps
+        ]
+    elif animation == "frames":
+        frames = [
+            go.Frame(
+                data=[
+                    go.Scatter(
+                        x=points["day"][:i],
+                        y=points["yhat"][:i],
+                        mode="lines+markers",
+                        name="Forecast",
+                        line=dict(color="red", dash="dash"),
+                    )
+                ],
+                traces=[0],
+                name=str(i),
+            )
+            for i in steps
+        ]
+    else:
+        raise ValueError(f"Unknown animation mode: {animation!r}")
+
+    fig.update(frames=frames)
+
+    frame_args = {
+        "frame": {"duration": ANIMATION_FRAME_DURATION, "redraw": True},
+        "transition": {"duration": 0},
+        "mode": "immediate",
+    }
+    fig.update_layout(
         sliders=[
             {
-                "active": 0,
+                "active": active,
                 "steps": [
                     {
-                        "label": str(i),
+                        "label": str(days[i - 1]),
                         "method": "animate",
-                        "args": [
-                            [str(i)],
-                            {
-                                "mode": "immediate",
-                                "frame": {"duration": 500, "redraw": True},
-                                "transition": {"duration": 0},
-                            },
-                        ],
+                        "args": [[str(i)], frame_args],
                     }
-                    for i in range(1, len(forecast) + 1)
+                    for i in steps
                 ],
                 "transition": {"duration": 0},
             }
@@ -101,14 +163,7 @@ def plot_forecast(forecast, periods):
             {
                 "buttons": [
                     {
-                        "args": [
-                            None,
-                            {
-                                "frame": {"duration": 500, "redraw": True},
-                                "fromcurrent": True,
-                                "mode": "immediate",
-                            },
-                        ],
+                        "args": [None, {**frame_args, "fromcurrent": from_current}],
                         "label": "Play",
                         "method": "animate",
                     }
@@ -125,34 +180,99 @@ def plot_forecast(forecast, periods):
         ],
     )
 
-    # Automatically start the animation by simulating a button click on render
+    return fig
+
+
+def plot_hole_forecasts(per_hole, aggregate):
+    # One faint line per hole, with the mean and min-max band across holes on top
+    fig = go.Figure()
+
+    for hole, forecast_hole in per_hole.groupby("hole"):
+        forecast_hole = downsample_frame(forecast_hole, "ds", "yhat")
+        fig.add_trace(
+            go.Scatter(
+                x=forecast_hole["ds"],
+                y=forecast_hole["yhat"],
+                mode="lines",
+                name=f"Hole {hole}",
+                line=dict(width=1),
+                opacity=0.4,
+            )
+        )
+
+    aggregate = downsample_frame(aggregate, "ds", "mean")
+    fig.add_trace(
+        go.Scatter(
+            x=aggregate["ds"].tolist() + aggregate["ds"][::-1].tolist(),
+            y=aggregate["max"].tolist() + aggregate["min"][::-1].tolist(),
+            fill="toself",
+            fillcolor="rgba(255, 0, 0, 0.1)",
+            line=dict(color="rgba(255, 255, 255, 0)"),
+            name="Rentang Min-Max",
+        )
+    )
+    fig.add_trace(
+        go.Scatter(
+            x=aggregate["ds"],
+            y=aggregate["mean"],
+            mode="lines+markers",
+            name="Rata-rata Semua Hole",
+            line=dict(color="red", width=3),
+        )
+    )
+
     fig.update_layout(
-        updatemenus=[
-            {
-                "buttons": [
-                    {
-                        "args": [
-                            None,
-                            {
-                                "frame": {"duration": 500, "redraw": True},
-                                "fromcurrent": True,
-                                "mode": "immediate",
-                            },
-                        ],
-                        "label": "Play",
-                        "method": "animate",
-                    }
-                ],
-                "direction": "left",
-                "pad": {"r": 10, "t": 87},
-                "showactive": False,
-                "type": "buttons",
-                "x": 0.1,
-                "xanchor": "right",
-                "y": 0,
-                "yanchor": "top",
-            }
-        ]
+        title="Perkiraan Jumlah Daun per Lubang (Hole)",
+        xaxis_title="Tanggal",
+        yaxis_title="Jumlah Daun",
+        hovermode="x unified",
+    )
+
+    return fig
+
+
+def plot_scenario_heatmap(result, feature_x, feature_y, day=None):
+    # Predicted leaf count on one day (default: last) for every scenario pair
+    day = result["day"].max() if day is None else day
+    table = result[result["day"] == day].pivot_table(
+        index=feature_y, columns=feature_x, values="yhat"
+    )
+
+    fig = go.Figure(
+        go.Heatmap(
+            x=table.columns,
+            y=table.index,
+            z=table.to_numpy(),
+            colorscale="Greens",
+            colorbar=dict(title="Daun"),
+        )
+    )
+    fig.update_layout(
+        title=f"Simulasi Jumlah Daun Hari ke-{day}: '{feature_x}' vs '{feature_y}'",
+        xaxis_title=feature_x,
+        yaxis_title=feature_y,
+    )
+
+    return fig
+
+
+def plot_violation_timeline(daily_violations):
+    # Share of out-of-range readings per day, one line per feature
+    fig = go.Figure()
+    for feature in daily_violations.columns:
+        fig.add_trace(
+            go.Scatter(
+                x=daily_violations.index,
+                y=daily_violations[feature] * 100,
+                mode="lines+markers",
+                name=feature,
+            )
+        )
+    fig.update_layout(
+        title="Persentase Data di Luar Rentang Optimal per Hari",
+        xaxis_title="Tanggal",
+        yaxis_title="Di luar rentang (%)",
+        yaxis=dict(range=[0, 100]),
     )
 
     return fig
@@ -207,35 +327,98 @@ def plot_growth_bar(
     return fig
 
 
-def visaulize_all_features(df):
-    # Convert datetime to 'day' since the start of data collection
-    df["day"] = (df["datetime"] - df["datetime"].min()).dt.days + 1
+def plot_daily_patterns(daily):
+    # Majority growth pattern per day, bar height = share of readings agreeing
+    colors = {1: "#f0ad4e", 2: "#5cb85c", 3: "#d9534f"}
+    fig = go.Figure()
+    for pattern, group in daily.groupby("Pattern"):
+        fig.add_trace(
+            go.Bar(
+                x=group.index,
+                y=group["share"] * 100,
+                name=group["label"].iloc[0],
+                marker_color=colors.get(pattern),
+            )
+        )
+    fig.update_layout(
+        title="Pola Pertumbuhan Mayoritas per Hari",
+        xaxis_title="Hari",
+        yaxis_title="Data dengan pola mayoritas (%)",
+        yaxis=dict(range=[0, 100]),
+    )
+
+    return fig
+
+
+# Features summarised per day for the feature visualizations
+DAILY_FEATURES = [
+    "LeafCount",
+    "hole",
+    "temperature",
+    "humidity",
+    "light",
+    "pH",
+    "EC",
+    "TDS",
+    "WaterTemp",
+]
+DAILY_STATISTICS = ["mean", "min", "max", "std", "count"]
+
+# Memoized daily aggregates, keyed by dataset content hash
+_DAILY_CACHE = OrderedDict()
+_DAILY_CACHE_LOCK = threading.Lock()
+DAILY_CACHE_SIZE = 16
+
+
+def day_index(df):
+    # Day since the start of data collection (first day = 1), without touching df
+    return ((df["datetime"] - df["datetime"].min()).dt.days + 1).rename("day")
+
+
+def build_daily_aggregates(df):
+    # Columns are (feature, statistic); index is the day number
+    features = [feature for feature in DAILY_FEATURES if feature in df.columns]
+    values = df[features].reset_index(drop=True)
+    day = day_index(df).reset_index(drop=True)
+    return values.groupby(day).agg(DAILY_STATISTICS)
+
+
+def daily_aggregates(df):
+    # Built once per uploaded dataset; later calls are a dictionary lookup
+    key = dataset_fingerprint(df)
+    with _DAILY_CACHE_LOCK:
+        if key in _DAILY_CACHE:
+            _DAILY_CACHE.move_to_end(key)
+            return _DAILY_CACHE[key]
+
+    daily = build_daily_aggregates(df)
 
-    # List of features to visualize
-    features = [
-        "LeafCount",
-        "hole",
-        "temperature",
-        "humidity",
-        "light",
-        "pH",
-        "EC",
-        "TDS",
-        "WaterTemp",
-    ]
+    with _DAILY_CACHE_LOCK:
+        _DAILY_CACHE[key] = daily
+        while len(_DAILY_CACHE) > DAILY_CACHE_SIZE:
+            _DAILY_CACHE.popitem(last=False)
+    return daily
 
-    # Group by 'day' and calculate the mean of each feature
-    daily_means = df.groupby("day")[features].mean().reset_index()
+
+def overall_mean(daily, feature):
+    # Mean over all rows, recovered from the per-day means and counts
+    counts = daily[(feature, "count")]
+    return (daily[(feature, "mean")] * counts).sum() / counts.sum()
+
+
+def visaulize_all_features(df, daily=None):
+    daily = daily_aggregates(df) if daily is None else daily
 
     # Loop through each feature and create a separate plot
-    for feature in features:
+    for feature in daily.columns.get_level_values(0).unique():
         fig = go.Figure()
 
         # Add the mean feature data as a trace
+        x, y = downsample_xy(daily.index, daily[(feature, "mean")])
         fig.add_trace(
             go.Scatter(
-                x=daily_means["day"],
-                y=daily_means[feature],
+                x=x,
+                y=y,
                 mode="lines+markers",
                 name=feature,
                 line=dict(width=2),
@@ -258,25 +441,25 @@ def visaulize_all_features(df):
         st.plotly_chart(fig, use_container_width=True)
 
 
-def visualize_feature(df, selected_feature):
-    # Convert datetime to 'day' since the start of data collection
-    df["day"] = (df["datetime"] - df["datetime"].min()).dt.days + 1
-
+def visualize_feature(df, selected_feature, daily=None):
     if selected_feature:
-        # Group by 'day' and calculate the mean of the selected feature
-        daily_means = df.groupby("day")[selected_feature].mean().reset_index()
+        daily = daily_aggregates(df) if daily is None else daily
+
+        # Daily means of the selected feature
+        daily_means = daily[(selected_feature, "mean")]
 
         # Calculate the total average of the selected feature
-        total_average = daily_means[selected_feature].mean()
+        total_average = daily_means.mean()
 
         # Create a figure for the selected feature
         fig = go.Figure()
 
         # Add the mean feature data as a trace
+        x, y = downsample_xy(daily.index, daily_means)
         fig.add_trace(
             go.Scatter(
-                x=daily_means["day"],
-                y=daily_means[selected_feature],
+                x=x,
+                y=y,
                 mode="lines+markers",
                 name=selected_feature,
                 line=dict(width=2),
@@ -310,39 +493,34 @@ def visualize_feature(df, selected_feature):
         st.write("🔍 Pilih fitur untuk divisualisasikan.")
 
 
-def visualize_comparison(df, feature_a, feature_b):
+def visualize_comparison(df, feature_a, feature_b, daily=None):
+    daily = daily_aggregates(df) if daily is None else daily
 
     # Menghitung rata-rata dari setiap fitur
-    mean_feature_a = df[feature_a].mean()
-    mean_feature_b = df[feature_b].mean()
+    mean_feature_a = overall_mean(daily, feature_a)
+    mean_feature_b = overall_mean(daily, feature_b)
 
-    # Menghitung jumlah hari sejak tanggal pertama
-    df["day"] = (df["datetime"] - df["datetime"].min()).dt.days + 1  # Hari pertama = 1
+    # Menghitung jumlah hari sejak tanggal pertama (hari pertama = 1)
+    day = day_index(df)
 
     # Buat figure untuk line chart
     fig = go.Figure()
 
-    # Tambahkan trace untuk feature_a
-    fig.add_trace(
-        go.Scatter(
-            x=df["day"],
-            y=df[feature_a],
-            mode="lines",
-            name=f"Rata-rata {feature_a} ({mean_feature_a:.2f})",
-            line=dict(color="blue"),
-        )
-    )
-
-    # Tambahkan trace untuk feature_b
-    fig.add_trace(
-        go.Scatter(
-            x=df["day"],
-            y=df[feature_b],
-            mode="lines",
-            name=f"Rata-rata {feature_b} ({mean_feature_b:.2f})",
-            line=dict(color="green"),
+    # Data mentah bisa ratusan ribu baris: kurangi per trace, puncak tetap terjaga
+    for feature, mean_value, color in [
+        (feature_a, mean_feature_a, "blue"),
+        (feature_b, mean_feature_b, "green"),
+    ]:
+        x, y = downsample_xy(day, df[feature], method="minmax")
+        fig.add_trace(
+            go.Scatter(
+                x=x,
+                y=y,
+                mode="lines",
+                name=f"Rata-rata {feature} ({mean_value:.2f})",
+                line=dict(color=color),
+            )
         )
-    )
 
     # Sesuaikan layout
     fig.update_layout(